@@ -0,0 +1,130 @@
+import hashlib
+import json
+
+from dedup import DedupStore
+from errors import ErrorAggregator
+from exceptions import AccountsConfigException
+from intervals import POLL_INTERVAL_DEFAULT
+from records import Status
+from transitions import StatusTracker
+
+
+class Account:
+    """
+    Учётная запись ученика: токен ЯндексДомашки и чат для уведомлений.
+    Хранит собственное состояние опроса и дедупликации сообщений.
+    """
+
+    def __init__(self, token, chat_id, dedup=None):
+        """
+        Создаёт учётную запись с пустым состоянием опроса.
+        dedup - общее хранилище отправленных уведомлений;
+        без него используется временное хранилище в памяти.
+        """
+        self.token = token
+        self.chat_id = chat_id
+        self.account_id = hashlib.sha256(token.encode()).hexdigest()[:16]
+        self.headers = {'Authorization': f'OAuth {token}'}
+        self.timestamp = 0
+        self.etag = None
+        self.payload_digest = None
+        self.tracker = StatusTracker()
+        self.interval = POLL_INTERVAL_DEFAULT
+        self.next_poll = 0
+        self.api_down = False
+        self.lag = 0
+        self.errors = ErrorAggregator()
+        if dedup is None:
+            dedup = DedupStore()
+        self.sent = dedup.namespace(self.account_id)
+
+    def __repr__(self):
+        """Токен в представление не попадает, чтобы не утёк в лог."""
+        return f'Account(chat_id={self.chat_id!r})'
+
+    @property
+    def statuses(self):
+        """Последние известные статусы работ: {id: Status}."""
+        return self.tracker.statuses
+
+    @statuses.setter
+    def statuses(self, statuses):
+        self.tracker = StatusTracker(statuses)
+
+    def snapshot(self):
+        """Состояние опроса в виде, пригодном для JSON."""
+        updated = self.tracker.updated
+        return {
+            'timestamp': self.timestamp,
+            'etag': self.etag,
+            'payload_digest': self.payload_digest,
+            'statuses': [
+                [homework_id, int(status), updated.get(homework_id)]
+                for homework_id, status in self.statuses.items()
+            ],
+            'interval': self.interval,
+            'next_poll': self.next_poll,
+            'api_down': self.api_down,
+        }
+
+    def restore(self, state):
+        """Восстанавливает состояние опроса из snapshot()."""
+        self.timestamp = state['timestamp']
+        self.etag = state['etag']
+        self.payload_digest = state['payload_digest']
+        statuses = {}
+        updated = {}
+        for homework_id, status, date_updated in state['statuses']:
+            statuses[homework_id] = Status(status)
+            updated[homework_id] = date_updated
+        self.tracker = StatusTracker(statuses, updated)
+        self.interval = state['interval']
+        self.next_poll = state['next_poll']
+        self.api_down = state['api_down']
+
+
+def load_accounts(path, dedup=None):
+    """
+    Читает список учётных записей из JSON-файла.
+    Формат: [{"token": "...", "chat_id": 123}, ...].
+    Токен должен быть строкой и встречаться в файле один раз:
+    по нему строятся account_id, состояние опроса и дедупликация.
+    """
+    try:
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+    except (OSError, ValueError) as error:
+        raise AccountsConfigException(
+            f'Не удалось прочитать файл учётных записей {path}: {error}'
+        )
+
+    if not isinstance(data, list):
+        raise AccountsConfigException(
+            f'Файл учётных записей {path} должен содержать список'
+        )
+
+    accounts = []
+    tokens = set()
+    for number, item in enumerate(data):
+        if not isinstance(item, dict):
+            raise AccountsConfigException(
+                f'Запись №{number} в {path} должна быть словарём'
+            )
+        token = item.get('token')
+        chat_id = item.get('chat_id')
+        if not token or not chat_id:
+            raise AccountsConfigException(
+                f'В записи №{number} в {path} нет token или chat_id'
+            )
+        if not isinstance(token, str):
+            raise AccountsConfigException(
+                f'token в записи №{number} в {path} должен быть строкой'
+            )
+        if token in tokens:
+            raise AccountsConfigException(
+                f'Запись №{number} в {path} повторяет token одной '
+                'из предыдущих записей'
+            )
+        tokens.add(token)
+        accounts.append(Account(token, chat_id, dedup))
+    return accounts
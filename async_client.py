@@ -0,0 +1,259 @@
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+
+from http_client import HTTP_CONNECT_TIMEOUT
+from http_client import HTTP_POOL_SIZE
+from http_client import HTTP_READ_TIMEOUT
+from http_client import STATS
+
+NO_BODY_CODES = frozenset((204, 304))
+MAX_LINE = 65536
+
+
+class Headers(dict):
+    """Заголовки ответа; имена хранятся в нижнем регистре."""
+
+    def __getitem__(self, name):
+        """Заголовок name без учёта регистра."""
+        return super().__getitem__(name.lower())
+
+    def __contains__(self, name):
+        """Есть ли заголовок name без учёта регистра."""
+        return super().__contains__(name.lower())
+
+    def get(self, name, default=None):
+        """Заголовок name без учёта регистра или default."""
+        return super().get(name.lower(), default)
+
+
+class AsyncResponse:
+    """Прочитанный целиком ответ с интерфейсом requests.Response."""
+
+    def __init__(self, status_code, headers, content, url):
+        """Ответ с кодом, заголовками и телом."""
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    def json(self):
+        """Тело ответа, разобранное из JSON."""
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        """Тело ответа кусками по chunk_size байт."""
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        """Тело уже прочитано, соединение возвращено в пул."""
+        pass
+
+    def __repr__(self):
+        """Как у requests.Response."""
+        return f'<AsyncResponse [{self.status_code}]>'
+
+
+class AsyncSession:
+    """
+    Неблокирующий HTTP/1.1 клиент для GET-запросов на asyncio.
+    Соединения к каждому хосту переиспользуются (keep-alive); одновременно
+    открыто не больше pool_size соединений к хосту, остальные запросы
+    ждут свободное соединение. Ожидающий запрос - это только корутина,
+    поэтому тысячи опросов в полёте не требуют тысяч потоков.
+    Любой сбой соединения, таймаут или ошибка разбора ответа -
+    ConnectionError. Клиент рассчитан только на API ЯндексДомашки:
+    перенаправления, прокси (HTTPS_PROXY) и сжатие (Content-Encoding)
+    не поддерживаются, ответ 3xx возвращается как есть.
+    """
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE,
+                 connect_timeout=HTTP_CONNECT_TIMEOUT,
+                 read_timeout=HTTP_READ_TIMEOUT):
+        """Пустой пул; соединения открываются при первых запросах."""
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.connections = 0
+        self.requests = 0
+        self._idle = {}
+        self._slots = {}
+        self._ssl = None
+
+    async def get(self, url, headers=None, params=None):
+        """GET-запрос; тело ответа читается целиком."""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        target = parts.path or '/'
+        if parts.query or params:
+            target += '?' + '&'.join(
+                query for query in (parts.query, urlencode(params or {}))
+                if query)
+        request = self._request_bytes(parts.netloc, target, headers)
+        slots = self._slots.get(key)
+        if slots is None:
+            slots = self._slots[key] = asyncio.Semaphore(self.pool_size)
+        start = time.monotonic()
+        try:
+            async with slots:
+                response = await self._send(key, request, url)
+        finally:
+            STATS.observe(time.monotonic() - start)
+        self.requests += 1
+        return response
+
+    async def close(self):
+        """Закрывает свободные соединения пула."""
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+    @staticmethod
+    def _request_bytes(host, target, headers):
+        lines = [
+            f'GET {target} HTTP/1.1',
+            f'Host: {host}',
+            'Accept: */*',
+            'Connection: keep-alive',
+        ]
+        lines.extend(
+            f'{name}: {value}' for name, value in (headers or {}).items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    async def _send(self, key, request, url):
+        """
+        Отправляет запрос по свободному или новому соединению.
+        Если сервер успел закрыть свободное соединение, запрос
+        повторяется по следующему свободному или новому: GET идемпотентен.
+        """
+        idle = self._idle.get(key)
+        reused = bool(idle)
+        reader, writer = idle.pop() if reused else await self._connect(key)
+        try:
+            response, keep_alive = await asyncio.wait_for(
+                self._exchange(reader, writer, request, url),
+                self.read_timeout)
+        except (OSError, EOFError, ValueError, asyncio.TimeoutError,
+                asyncio.LimitOverrunError) as error:
+            writer.close()
+            if reused and not isinstance(error, asyncio.TimeoutError):
+                return await self._send(key, request, url)
+            raise ConnectionError(f'{url}: {error!r}') from error
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive:
+            self._idle.setdefault(key, []).append((reader, writer))
+        else:
+            writer.close()
+        return response
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        ssl = None
+        if scheme == 'https':
+            if self._ssl is None:
+                import ssl as ssl_module
+
+                self._ssl = ssl_module.create_default_context()
+            ssl = self._ssl
+        port = port or (443 if ssl else 80)
+        try:
+            connection = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=ssl, limit=MAX_LINE),
+                self.connect_timeout)
+        except (OSError, asyncio.TimeoutError) as error:
+            raise ConnectionError(f'{host}:{port}: {error!r}') from error
+        self.connections += 1
+        return connection
+
+    async def _exchange(self, reader, writer, request, url):
+        """Пишет запрос и читает ответ: (AsyncResponse, keep_alive)."""
+        writer.write(request)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise EOFError('соединение закрыто сервером')
+        version, code, *_ = status_line.decode('latin-1').split(None, 2)
+        code = int(code)
+        headers = Headers()
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        connection = headers.get('Connection', '').lower()
+        keep_alive = (
+            connection != 'close'
+            and (version == 'HTTP/1.1' or connection == 'keep-alive'))
+        if code in NO_BODY_CODES or 100 <= code < 200:
+            content = b''
+        elif headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            content = await self._read_chunked(reader)
+        elif 'Content-Length' in headers:
+            content = await reader.readexactly(
+                int(headers['Content-Length']))
+        else:
+            content = await reader.read()
+            keep_alive = False
+        return AsyncResponse(code, headers, content, url), keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader):
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if not size:
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        return b''.join(chunks)
+
+
+class AsyncPoller:
+    """
+    Цикл событий asyncio в фоновом потоке с интерфейсом пула потоков.
+    submit(func, *args) запускает корутину func(session, *args) в цикле
+    и возвращает concurrent.futures.Future, поэтому homework.poll_accounts
+    работает с ним так же, как с ThreadPoolExecutor.
+    """
+
+    coroutines = True
+
+    def __init__(self, session=None):
+        """Запускает цикл событий; session - общий AsyncSession."""
+        self.session = AsyncSession() if session is None else session
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name='async-poller', daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args):
+        """Запускает корутину func(session, *args) в цикле событий."""
+        return asyncio.run_coroutine_threadsafe(
+            func(self.session, *args), self.loop)
+
+    def shutdown(self, wait=True):
+        """Закрывает соединения и останавливает цикл событий."""
+        asyncio.run_coroutine_threadsafe(
+            self.session.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if wait:
+            self._thread.join()
+            self.loop.close()
+
+    def __enter__(self):
+        """Для with, как у ThreadPoolExecutor."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Останавливает цикл событий при выходе из with."""
+        self.shutdown()
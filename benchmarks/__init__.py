@@ -0,0 +1 @@
+"""Нагрузочные прогоны бота против фейковых серверов."""
@@ -0,0 +1,243 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from replay import ReplayResponse
+
+PRACTICUM_PATH = '/api/user_api/homework_statuses/'
+STATUSES = ('reviewing', 'rejected', 'approved')
+
+
+class FakeServer(ThreadingHTTPServer):
+    """
+    Локальный HTTP-сервер в фоновом потоке.
+    latency - задержка ответа в секундах,
+    error_rate - доля ответов с кодом 500.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, handler, latency=0.0, error_rate=0.0, seed=0):
+        """Создаёт сервер на свободном порту 127.0.0.1."""
+        super().__init__(('127.0.0.1', 0), handler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self._thread = None
+
+    @property
+    def url(self):
+        """Базовый адрес сервера."""
+        return f'http://127.0.0.1:{self.server_port}'
+
+    def start(self):
+        """Запускает обработку запросов в фоновом потоке."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Останавливает сервер."""
+        self.shutdown()
+        self.server_close()
+
+    def should_fail(self):
+        """Учитывает запрос и решает, отвечать ли ошибкой."""
+        with self.lock:
+            self.requests += 1
+            return self.random.random() < self.error_rate
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    """Общие методы обработчиков фейковых серверов."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def reply(self, code, data):
+        """Отправляет JSON-ответ с задержкой сервера."""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Запросы не пишутся в stderr."""
+        pass
+
+
+class HomeworkSource:
+    """
+    Работы учётных записей фейкового API ЯндексДомашки.
+    У каждого токена homeworks работ; при каждом запросе с вероятностью
+    change_rate одна из них меняет статус. comment_size задаёт размер
+    поля reviewer_comment, то есть размер ответа. clock - источник
+    времени для date_updated и current_date.
+    """
+
+    def __init__(self, homeworks=10, change_rate=0.1, comment_size=100,
+                 seed=0, clock=time.time):
+        """Создаёт источник; работы заводятся при первом запросе токена."""
+        self.homeworks = homeworks
+        self.change_rate = change_rate
+        self.comment = 'x' * comment_size
+        self.clock = clock
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self._accounts = {}
+
+    def homeworks_for(self, token):
+        """Текущий список работ токена (с возможным изменением статуса)."""
+        now = int(self.clock())
+        with self.lock:
+            homeworks = self._accounts.get(token)
+            if homeworks is None:
+                homeworks = self._accounts[token] = [
+                    self._homework(number, now)
+                    for number in range(self.homeworks)
+                ]
+            elif homeworks and self.random.random() < self.change_rate:
+                homework = self.random.choice(homeworks)
+                homework['status'] = self.random.choice(STATUSES)
+                homework['_updated'] = now
+                homework['date_updated'] = time.strftime(
+                    '%Y-%m-%dT%H:%M:%SZ', time.gmtime(now))
+            return [dict(homework) for homework in homeworks]
+
+    def answer(self, token, from_date):
+        """Тело ответа API: работы, изменённые начиная с from_date."""
+        return {
+            'homeworks': [
+                {
+                    key: value for key, value in homework.items()
+                    if key != '_updated'
+                }
+                for homework in self.homeworks_for(token)
+                if homework['_updated'] >= from_date
+            ],
+            'current_date': int(self.clock()),
+        }
+
+    def _homework(self, number, now):
+        return {
+            'id': number,
+            'status': self.random.choice(STATUSES),
+            'homework_name': f'user__hw{number:03d}.zip',
+            'reviewer_comment': self.comment,
+            'date_updated': time.strftime(
+                '%Y-%m-%dT%H:%M:%SZ', time.gmtime(now)),
+            'lesson_name': f'Спринт {number}',
+            '_updated': now,
+        }
+
+
+class PracticumHandler(JSONHandler):
+    """Имитация GET homework_statuses ЯндексДомашки."""
+
+    def do_GET(self):
+        """Список работ учётной записи из заголовка Authorization."""
+        url = urlparse(self.path)
+        token = self.headers.get('Authorization', '')
+        if url.path != PRACTICUM_PATH or not token.startswith('OAuth '):
+            self.reply(401, {'code': 'not_authenticated'})
+            return
+        if self.server.should_fail():
+            self.reply(500, {'code': 'internal_error'})
+            return
+        from_date = int(parse_qs(url.query).get('from_date', ['0'])[0])
+        self.reply(200, self.server.source.answer(
+            token[len('OAuth '):], from_date))
+
+
+class FakePracticum(FakeServer):
+    """Фейковый API ЯндексДомашки поверх HomeworkSource."""
+
+    def __init__(self, homeworks=10, change_rate=0.1, comment_size=100,
+                 **kwargs):
+        """Создаёт сервер; работы заводятся при первом запросе токена."""
+        super().__init__(PracticumHandler, **kwargs)
+        self.source = HomeworkSource(
+            homeworks, change_rate, comment_size, seed=kwargs.get('seed', 0))
+
+    @property
+    def endpoint(self):
+        """Адрес, подставляемый вместо PRACTICUM_ENDPOINT."""
+        return self.url + PRACTICUM_PATH
+
+    def homeworks_for(self, token):
+        """Текущий список работ токена (с возможным изменением статуса)."""
+        return self.source.homeworks_for(token)
+
+
+class PracticumSession:
+    """
+    Подмена сессии requests, отвечающая из HomeworkSource без сети.
+    Ставится через http_client.use_session; удобна для симуляции
+    с виртуальным временем, где настоящий сервер не нужен.
+    """
+
+    def __init__(self, source):
+        """Сессия поверх source."""
+        self.source = source
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        """Ответ API для токена из headers."""
+        with self._lock:
+            self.requests += 1
+        token = (headers or {}).get('Authorization', '')[len('OAuth '):]
+        from_date = int((params or {}).get('from_date', 0))
+        return ReplayResponse({
+            'url': url,
+            'status': 200,
+            'body': json.dumps(self.source.answer(token, from_date)),
+        })
+
+
+class TelegramHandler(JSONHandler):
+    """Имитация метода sendMessage Telegram Bot API."""
+
+    def do_POST(self):
+        """Принимает сообщение и отвечает объектом Message."""
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        if self.server.should_fail():
+            self.reply(500, {'ok': False, 'error_code': 500,
+                             'description': 'Internal Server Error'})
+            return
+        with self.server.lock:
+            self.server.messages += 1
+            message_id = self.server.messages
+        self.reply(200, {'ok': True, 'result': {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': int(payload.get('chat_id', 0)), 'type': 'private'},
+            'text': payload.get('text', ''),
+        }})
+
+
+class FakeTelegram(FakeServer):
+    """Фейковый Telegram Bot API; считает принятые сообщения."""
+
+    def __init__(self, **kwargs):
+        """Создаёт сервер."""
+        super().__init__(TelegramHandler, **kwargs)
+        self.messages = 0
+
+    @property
+    def base_url(self):
+        """Адрес для telegram.Bot(base_url=...)."""
+        return self.url + '/bot'
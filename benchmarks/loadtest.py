@@ -0,0 +1,182 @@
+"""
+Нагрузочный прогон основного цикла бота.
+Цикл работает против локальных фейковых серверов ЯндексДомашки и Telegram.
+
+Запуск из корня репозитория:
+    python -m benchmarks.loadtest --accounts 1000 --homeworks 20
+Результат - одна строка JSON; с --output она дописывается в файл,
+чтобы сравнивать прогоны разных коммитов.
+"""
+import argparse
+import gc
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import telegram
+
+import homework
+from accounts import Account
+from async_client import AsyncPoller
+from async_client import AsyncSession
+from benchmarks.fakes import FakePracticum
+from benchmarks.fakes import FakeTelegram
+from dedup import DedupStore
+from outbox import Outbox
+from ratelimit import TokenBucket
+from scheduler import PollScheduler
+
+
+def percentile(values, fraction):
+    """Перцентиль fraction (0..1) по методу ближайшего ранга."""
+    ordered = sorted(values)
+    index = max(int(round(fraction * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def git_revision():
+    """Короткий хэш текущего коммита или None вне git."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def max_rss_mb():
+    """Пиковый размер резидентной памяти процесса, МБ."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss /= 1024
+    return round(rss / 1024, 1)
+
+
+def run(options):
+    """Прогоняет options.cycles циклов и возвращает словарь результатов."""
+    practicum = FakePracticum(
+        homeworks=options.homeworks,
+        change_rate=options.change_rate,
+        comment_size=options.comment_size,
+        latency=options.api_latency,
+        error_rate=options.api_errors,
+        seed=options.seed,
+    ).start()
+    fake_telegram = FakeTelegram(
+        latency=options.telegram_latency,
+        error_rate=options.telegram_errors,
+        seed=options.seed,
+    ).start()
+    endpoint = homework.PRACTICUM_ENDPOINT
+    homework.PRACTICUM_ENDPOINT = practicum.endpoint
+    limiter = homework.PRACTICUM_LIMITER
+    homework.PRACTICUM_LIMITER = (
+        TokenBucket(options.api_rate, options.api_burst)
+        if options.api_rate else None
+    )
+    bot = telegram.Bot(
+        token='123456:loadtest',
+        base_url=fake_telegram.base_url,
+        request=telegram.utils.request.Request(
+            con_pool_size=options.senders),
+    )
+    outbox = Outbox(
+        bot,
+        senders=options.senders,
+        global_rate=options.telegram_rate,
+        chat_rate=options.telegram_rate,
+    )
+    outbox.start()
+    dedup = DedupStore()
+    accounts = [
+        Account(f'token-{number}', number + 1, dedup)
+        for number in range(options.accounts)
+    ]
+    gc.collect()
+    rss_before = max_rss_mb()
+    cycle_times = []
+    started = time.perf_counter()
+    try:
+        if options.asyncio:
+            pool = AsyncPoller(AsyncSession(pool_size=options.workers))
+        else:
+            pool = ThreadPoolExecutor(max_workers=options.workers)
+        with pool as executor:
+            for _ in range(options.cycles):
+                for account in accounts:
+                    account.next_poll = 0
+                schedule = PollScheduler(accounts)
+                cycle_start = time.perf_counter()
+                homework.run_cycle(outbox, schedule, executor, dedup)
+                outbox.join()
+                cycle_times.append(time.perf_counter() - cycle_start)
+        elapsed = time.perf_counter() - started
+    finally:
+        outbox.close(timeout=10)
+        homework.PRACTICUM_ENDPOINT = endpoint
+        homework.PRACTICUM_LIMITER = limiter
+        practicum.stop()
+        fake_telegram.stop()
+
+    polls = options.accounts * options.cycles
+    return {
+        'revision': git_revision(),
+        'accounts': options.accounts,
+        'homeworks': options.homeworks,
+        'cycles': options.cycles,
+        'workers': options.workers,
+        'asyncio': options.asyncio,
+        'polls_per_second': round(polls / elapsed, 1),
+        'cycle_p50': round(statistics.median(cycle_times), 4),
+        'cycle_p99': round(percentile(cycle_times, 0.99), 4),
+        'api_requests': practicum.requests,
+        'telegram_messages': fake_telegram.messages,
+        'rss_max_mb': max_rss_mb(),
+        'rss_growth_mb': round(max_rss_mb() - rss_before, 1),
+    }
+
+
+def parse_args(argv=None):
+    """Параметры прогона из командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--accounts', type=int, default=100)
+    parser.add_argument('--homeworks', type=int, default=10)
+    parser.add_argument('--cycles', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=homework.POLL_WORKERS)
+    parser.add_argument(
+        '--asyncio', action='store_true',
+        help='опрашивать в цикле событий; --workers - размер пула соединений')
+    parser.add_argument('--senders', type=int, default=4)
+    parser.add_argument('--change-rate', type=float, default=0.1)
+    parser.add_argument('--comment-size', type=int, default=100)
+    parser.add_argument('--api-latency', type=float, default=0.0)
+    parser.add_argument('--api-errors', type=float, default=0.0)
+    parser.add_argument(
+        '--api-rate', type=float, default=0.0,
+        help='ограничение запросов к API в секунду (0 - без ограничения)')
+    parser.add_argument('--api-burst', type=float, default=None)
+    parser.add_argument('--telegram-latency', type=float, default=0.0)
+    parser.add_argument('--telegram-errors', type=float, default=0.0)
+    parser.add_argument('--telegram-rate', type=float, default=1e6)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='дописать результат в файл')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Точка входа: прогон и вывод результата."""
+    options = parse_args(argv)
+    result = json.dumps(run(options), ensure_ascii=False)
+    print(result)
+    if options.output:
+        with open(options.output, 'a', encoding='utf-8') as file:
+            file.write(result + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Длительная симуляция основного цикла бота в виртуальном времени.
+Недели опросов прогоняются за секунды против фейкового API без сети.
+
+Запуск из корня репозитория:
+    python -m benchmarks.soak --accounts 50 --days 14
+Результат - одна строка JSON с замерами по каждому симулированному дню:
+число уведомлений, память процесса и число живых объектов. Рост этих
+величин от дня к дню при стабильной нагрузке указывает на утечку,
+а poll_interval_avg показывает, выдерживается ли частота опросов.
+"""
+import argparse
+import gc
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import homework
+import http_client
+from accounts import Account
+from benchmarks.fakes import HomeworkSource
+from benchmarks.fakes import PracticumSession
+from benchmarks.loadtest import git_revision
+from benchmarks.loadtest import max_rss_mb
+from clock import VirtualClock
+from dedup import DedupStore
+from metrics import MESSAGES
+from outbox import Outbox
+from scheduler import PollScheduler
+
+DAY = 60 * 60 * 24
+START = 1_600_000_000
+
+
+class CountingBot:
+    """Бот, который только считает отправленные сообщения."""
+
+    def __init__(self):
+        """Создаёт бота без сообщений."""
+        self.messages = 0
+
+    def send_message(self, chat_id, text):
+        """Учитывает сообщение."""
+        self.messages += 1
+
+
+def sample(day, messages):
+    """Замер одного симулированного дня."""
+    gc.collect()
+    return {
+        'day': day,
+        'messages': messages,
+        'rss_mb': max_rss_mb(),
+        'objects': len(gc.get_objects()),
+    }
+
+
+def run(options):
+    """Симулирует options.days дней и возвращает словарь результатов."""
+    clock = VirtualClock(START)
+    source = HomeworkSource(
+        homeworks=options.homeworks,
+        change_rate=options.change_rate,
+        comment_size=options.comment_size,
+        seed=options.seed,
+        clock=clock.time,
+    )
+    session = PracticumSession(source)
+    get_session = http_client.get_session
+    http_client.get_session = lambda: session
+    limiter = homework.PRACTICUM_LIMITER
+    homework.PRACTICUM_LIMITER = None
+    bot = CountingBot()
+    outbox = Outbox(bot, senders=1, global_rate=1e9, chat_rate=1e9)
+    outbox.start()
+    dedup = DedupStore(clock=clock.time)
+    accounts = [
+        Account(f'token-{number}', number + 1, dedup)
+        for number in range(options.accounts)
+    ]
+    schedule = PollScheduler(accounts)
+    days = []
+    cycles = 0
+    sent = MESSAGES.get(result='sent')
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=options.workers) as executor:
+            for day in range(1, options.days + 1):
+                while clock.time() < START + day * DAY:
+                    homework.run_loop(
+                        outbox, schedule, executor, dedup, clock, cycles=1)
+                    outbox.join()
+                    cycles += 1
+                now_sent = MESSAGES.get(result='sent')
+                days.append(sample(day, now_sent - sent))
+                sent = now_sent
+        elapsed = time.perf_counter() - started
+        dedup_keys = len(dedup)
+    finally:
+        outbox.close(timeout=10)
+        http_client.get_session = get_session
+        homework.PRACTICUM_LIMITER = limiter
+        dedup.close()
+
+    simulated = clock.time() - START
+    return {
+        'revision': git_revision(),
+        'accounts': options.accounts,
+        'homeworks': options.homeworks,
+        'cycles': cycles,
+        'simulated_days': round(simulated / DAY, 2),
+        'wall_seconds': round(elapsed, 2),
+        'speedup': round(simulated / elapsed),
+        'api_requests': session.requests,
+        'poll_interval_avg': round(
+            simulated * options.accounts / max(session.requests, 1), 1),
+        'telegram_messages': bot.messages,
+        'dedup_keys': dedup_keys,
+        'days': days,
+        'rss_growth_mb': round(days[-1]['rss_mb'] - days[0]['rss_mb'], 1),
+    }
+
+
+def parse_args(argv=None):
+    """Параметры симуляции из командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--accounts', type=int, default=20)
+    parser.add_argument('--homeworks', type=int, default=10)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--change-rate', type=float, default=0.1)
+    parser.add_argument('--comment-size', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='дописать результат в файл')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Точка входа: симуляция и вывод результата."""
+    options = parse_args(argv)
+    result = json.dumps(run(options), ensure_ascii=False)
+    print(result)
+    if options.output:
+        with open(options.output, 'a', encoding='utf-8') as file:
+            file.write(result + '\n')
+
+
+if __name__ == '__main__':
+    main()
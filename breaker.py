@@ -0,0 +1,90 @@
+import os
+import threading
+
+from intervals import POLL_JITTER
+from intervals import with_jitter
+from metrics import API_CIRCUIT_OPEN
+
+PRACTICUM_BREAKER_THRESHOLD = int(os.getenv('PRACTICUM_BREAKER_THRESHOLD', 3))
+PRACTICUM_BREAKER_DELAY = int(os.getenv('PRACTICUM_BREAKER_DELAY', 60))
+PRACTICUM_BREAKER_MAX_DELAY = int(
+    os.getenv('PRACTICUM_BREAKER_MAX_DELAY', 60 * 60))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Автомат защиты для обращений к одному API.
+    После threshold неудач подряд запросы запрещаются (open) на delay
+    секунд, затем пропускается один пробный запрос (half_open).
+    Удача пробы закрывает автомат, неудача снова открывает его
+    с удвоенной задержкой, но не дольше max_delay.
+    Время передаётся явно, чтобы автомат работал и с виртуальными часами.
+    """
+
+    def __init__(self, threshold=PRACTICUM_BREAKER_THRESHOLD,
+                 delay=PRACTICUM_BREAKER_DELAY,
+                 max_delay=PRACTICUM_BREAKER_MAX_DELAY, jitter=POLL_JITTER):
+        """Создаёт закрытый автомат."""
+        self.threshold = threshold
+        self.delay = delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.open_until = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        """Запрещены ли сейчас обычные запросы."""
+        return self.state != CLOSED
+
+    @property
+    def retry_at(self):
+        """Когда будет разрешён пробный запрос; 0, если автомат закрыт."""
+        with self._lock:
+            return self.open_until if self.state != CLOSED else 0
+
+    def allow(self, now):
+        """
+        Можно ли выполнить запрос в момент now.
+        После истечения задержки разрешает ровно один пробный запрос.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and now >= self.open_until:
+                self.state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        """Учитывает удачный запрос; True, если API восстановился."""
+        with self._lock:
+            recovered = self.state != CLOSED
+            self.state = CLOSED
+            self.failures = 0
+            self.opened = 0
+            API_CIRCUIT_OPEN.set(0)
+            return recovered
+
+    def record_failure(self, now):
+        """Учитывает неудачный запрос; True, если автомат открылся."""
+        with self._lock:
+            self.failures += 1
+            if self.state == OPEN:
+                return False
+            if self.state == CLOSED and self.failures < self.threshold:
+                return False
+            self.opened += 1
+            delay = min(
+                self.delay * 2 ** (self.opened - 1), self.max_delay)
+            self.open_until = now + with_jitter(delay, self.jitter)
+            self.state = OPEN
+            API_CIRCUIT_OPEN.set(1)
+            return True
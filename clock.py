@@ -0,0 +1,44 @@
+import threading
+import time
+
+
+class SystemClock:
+    """Настоящее время: time.time и time.sleep."""
+
+    def time(self):
+        """Текущее время, секунды от эпохи."""
+        return time.time()
+
+    def sleep(self, seconds):
+        """Засыпает на seconds секунд."""
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    Виртуальное время для симуляции основного цикла.
+    sleep не ждёт, а сдвигает время вперёд, поэтому недели
+    опросов прогоняются за секунды.
+    """
+
+    def __init__(self, start=0.0):
+        """Часы, показывающие start."""
+        self._now = start
+        self._lock = threading.Lock()
+
+    def time(self):
+        """Текущее виртуальное время."""
+        with self._lock:
+            return self._now
+
+    def sleep(self, seconds):
+        """Сдвигает время на seconds секунд без ожидания."""
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        """Сдвигает время вперёд; назад часы не идут."""
+        with self._lock:
+            self._now += max(seconds, 0)
+
+
+SYSTEM_CLOCK = SystemClock()
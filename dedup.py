@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+
+from state import connect
+
+DEDUP_DB = os.getenv('DEDUP_DB', 'dedup.sqlite3')
+DEDUP_MAX_ENTRIES = int(os.getenv('DEDUP_MAX_ENTRIES', 200000))
+DEDUP_TTL = int(os.getenv('DEDUP_TTL', 60 * 60 * 24 * 90))
+
+
+class DedupStore:
+    """
+    Множество уже отправленных уведомлений, хранимое в SQLite.
+    Ключи вытесняются по давности использования (LRU) и по возрасту (TTL),
+    поэтому размер хранилища ограничен, а после перезапуска
+    повторные уведомления не отправляются.
+    """
+
+    def __init__(self, path=':memory:', max_entries=DEDUP_MAX_ENTRIES,
+                 ttl=DEDUP_TTL, clock=time.time):
+        """Открывает (или создаёт) базу path."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._connection = connect(path)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS seen ('
+            'key TEXT PRIMARY KEY, used_at REAL NOT NULL)'
+        )
+        self._connection.execute(
+            'CREATE INDEX IF NOT EXISTS seen_used_at ON seen (used_at)'
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def _encode(key):
+        return json.dumps(key, ensure_ascii=False, separators=(',', ':'))
+
+    def contains(self, key):
+        """Был ли ключ уже отправлен; попадание продлевает жизнь ключа."""
+        encoded = self._encode(key)
+        with self._lock:
+            cursor = self._connection.execute(
+                'UPDATE seen SET used_at = ? WHERE key = ?',
+                (self.clock(), encoded)
+            )
+            return cursor.rowcount > 0
+
+    def add(self, key):
+        """
+        Запоминает ключ.
+        На диск ключи попадают одной транзакцией на цикл: при prune,
+        commit или close.
+        """
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO seen (key, used_at) VALUES (?, ?)',
+                (self._encode(key), self.clock())
+            )
+
+    def commit(self):
+        """Сохраняет накопленные изменения на диск."""
+        with self._lock:
+            self._connection.commit()
+
+    def prune(self):
+        """
+        Удаляет ключи старше ttl и самые давние сверх max_entries.
+        Возвращает число удалённых ключей.
+        """
+        with self._lock:
+            removed = self._connection.execute(
+                'DELETE FROM seen WHERE used_at < ?',
+                (self.clock() - self.ttl,)
+            ).rowcount
+            removed += self._connection.execute(
+                'DELETE FROM seen WHERE key IN ('
+                'SELECT key FROM seen ORDER BY used_at DESC '
+                'LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            ).rowcount
+            self._connection.commit()
+            return removed
+
+    def __len__(self):
+        """Число хранимых ключей."""
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM seen').fetchone()[0]
+
+    def namespace(self, name):
+        """Представление хранилища с ключами одной учётной записи."""
+        return DedupNamespace(self, name)
+
+    def close(self):
+        """Сохраняет изменения и закрывает базу."""
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
+
+
+class DedupNamespace:
+    """Ключи одной учётной записи внутри общего DedupStore."""
+
+    def __init__(self, store, name):
+        """Привязывает представление к store с префиксом name."""
+        self.store = store
+        self.name = name
+
+    def __contains__(self, key):
+        """Был ли ключ уже отправлен в этой учётной записи."""
+        return self.store.contains([self.name, *key])
+
+    def add(self, key):
+        """Запоминает ключ в этой учётной записи."""
+        self.store.add([self.name, *key])
+
+
+def homework_key(record):
+    """Ключ дедупликации работы HomeworkRecord: (id, status, date_updated)."""
+    return ('homework', record.id, record.status.label, record.date_updated)
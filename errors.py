@@ -0,0 +1,131 @@
+import os
+import traceback
+from collections import deque
+from collections import namedtuple
+
+ERROR_DIGEST_WINDOW = int(os.getenv('ERROR_DIGEST_WINDOW', 3600))
+ERROR_DIGEST_INTERVAL = int(os.getenv('ERROR_DIGEST_INTERVAL', 3600))
+ERROR_DIGEST_MAX_GROUPS = int(os.getenv('ERROR_DIGEST_MAX_GROUPS', 20))
+ERROR_DIGEST_SLOTS = 12
+ERROR_EXAMPLE_SIZE = 200
+OTHER_GROUP = ('Прочие ошибки', '')
+
+ErrorEvent = namedtuple('ErrorEvent', 'kind site text')
+ErrorEvent.__doc__ = """
+Ошибка одного опроса: класс исключения kind, место site
+(функция, где оно возникло) и текст сообщения.
+"""
+
+
+def error_event(error, site=None):
+    """
+    Описание исключения error в виде ErrorEvent.
+    Если site не задан, берётся функция самого глубокого кадра traceback.
+    """
+    if site is None:
+        frames = traceback.extract_tb(error.__traceback__)
+        site = frames[-1].name if frames else ''
+    return ErrorEvent(type(error).__name__, site, str(error))
+
+
+class ErrorGroup:
+    """Счётчики одной группы ошибок по слотам окна и последний пример."""
+
+    __slots__ = ('slots', 'example')
+
+    def __init__(self):
+        """Пустая группа."""
+        self.slots = deque()
+        self.example = ''
+
+    def add(self, slot, text):
+        """Учитывает ошибку с текстом text в слоте slot."""
+        if self.slots and self.slots[-1][0] == slot:
+            self.slots[-1][1] += 1
+        else:
+            self.slots.append([slot, 1])
+        self.example = text[:ERROR_EXAMPLE_SIZE]
+
+    def expire(self, oldest):
+        """Отбрасывает слоты старше oldest и возвращает число ошибок."""
+        while self.slots and self.slots[0][0] < oldest:
+            self.slots.popleft()
+        return sum(count for _, count in self.slots)
+
+
+class ErrorAggregator:
+    """
+    Ошибки одной учётной записи, сгруппированные по (класс, место).
+    Ошибки считаются в скользящем окне window секунд, разбитом
+    на слоты; в чат уходит одна сводка не чаще раза в interval секунд
+    и только если с прошлой сводки были новые ошибки.
+    Групп не больше max_groups: остальные ошибки попадают в общую
+    группу «Прочие ошибки», поэтому память ограничена при любом
+    разнообразии текстов.
+    """
+
+    __slots__ = (
+        'window', 'interval', 'max_groups', 'slot_size', 'groups',
+        'pending', 'sent_at')
+
+    def __init__(self, window=ERROR_DIGEST_WINDOW,
+                 interval=ERROR_DIGEST_INTERVAL,
+                 max_groups=ERROR_DIGEST_MAX_GROUPS):
+        """Пустой агрегатор; время передаётся в add и digest явно."""
+        self.window = window
+        self.interval = interval
+        self.max_groups = max_groups
+        self.slot_size = max(window / ERROR_DIGEST_SLOTS, 1)
+        self.groups = {}
+        self.pending = 0
+        self.sent_at = None
+
+    def __len__(self):
+        """Число групп ошибок в окне."""
+        return len(self.groups)
+
+    def add(self, event, now):
+        """Учитывает ErrorEvent event, случившийся в момент now."""
+        key = (event.kind, event.site)
+        group = self.groups.get(key)
+        if group is None:
+            if len(self.groups) >= self.max_groups:
+                key = OTHER_GROUP
+            group = self.groups.setdefault(key, ErrorGroup())
+        group.add(int(now // self.slot_size), event.text)
+        self.pending += 1
+
+    def counts(self, now):
+        """{(класс, место): (число ошибок в окне, пример)} на момент now."""
+        oldest = int((now - self.window) // self.slot_size)
+        result = {}
+        for key, group in list(self.groups.items()):
+            count = group.expire(oldest)
+            if count:
+                result[key] = (count, group.example)
+            else:
+                del self.groups[key]
+        return result
+
+    def digest(self, now):
+        """
+        Текст сводки ошибок за окно или None.
+        None - если с прошлой сводки ошибок не было или interval секунд
+        ещё не прошло. Первая ошибка сообщается сразу, следующие -
+        сводкой не раньше чем через interval секунд.
+        """
+        if not self.pending:
+            return None
+        if self.sent_at is not None and now - self.sent_at < self.interval:
+            return None
+        counts = self.counts(now)
+        self.pending = 0
+        if not counts:
+            return None
+        self.sent_at = now
+        lines = [f'Сбои в работе программы за {self.window // 60} мин:']
+        for (kind, site), (count, example) in sorted(
+                counts.items(), key=lambda item: -item[1][0]):
+            place = f' в {site}' if site else ''
+            lines.append(f'{kind}{place}: {count} раз, последний: {example}')
+        return '\n'.join(lines)
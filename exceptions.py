@@ -14,3 +14,24 @@ class APIAnsverWrongData(Exception):
     """Удалённый API ответил неверными данными."""
 
     pass
+
+
+class AccountsConfigException(Exception):
+    """Файл со списком учётных записей отсутствует или некорректен."""
+
+    pass
+
+
+class APIUnavailableException(APIAnswerInvalidException):
+    """Удалённый API недоступен: сетевая ошибка, таймаут или код 5xx."""
+
+    pass
+
+
+class APIRateLimitedException(APIAnswerInvalidException):
+    """Удалённый API ограничил частоту запросов (код 429)."""
+
+    def __init__(self, message, retry_after):
+        """retry_after - через сколько секунд API разрешает повтор."""
+        super().__init__(message)
+        self.retry_after = retry_after
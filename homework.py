@@ -1,122 +1,314 @@
 import os
-import time
-import requests
+import re
+import hashlib
+import sys
+import argparse
 import logging
-import telegram
-from logging.handlers import RotatingFileHandler
+import http_client
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from collections import namedtuple
 from datetime import datetime as dt_dt
 from dotenv import load_dotenv
+from accounts import Account
+from accounts import load_accounts
+from breaker import CircuitBreaker
+from clock import SYSTEM_CLOCK
+from dedup import DEDUP_DB
+from dedup import DedupStore
+from dedup import homework_key
+from errors import ErrorEvent
+from errors import error_event
+from intervals import POLL_INTERVAL_ACTIVE
+from intervals import POLL_INTERVAL_DEFAULT
+from intervals import next_interval
+from intervals import sleep_time
+from intervals import spread_start
+from intervals import with_jitter
+from logs import Lazy
+from logs import Short
+from logs import setup_logging
+from metrics import API_RESPONSES
+from metrics import LOOP_LAG
+from metrics import MESSAGES
+from metrics import METRICS_PORT
+from metrics import POLLS
+from metrics import STAGE_EXCEPTIONS
+from metrics import start_metrics_server
+from metrics import timed
+from metrics import timed_async
+from outbox import Outbox
+from profiling import Profiler
+from ratelimit import PRACTICUM_BURST
+from ratelimit import PRACTICUM_RATE
+from ratelimit import TokenBucket
+from ratelimit import retry_after_seconds
+from records import HomeworkRecord
+from scheduler import PollScheduler
+from sinks import FanOut
+from sinks import Notification
+from sinks import default_sinks
+from records import Status
+from state import STATE_DB
+from state import StateStore
+from stream import HomeworkStream
 from exceptions import APIAnsverWrongData
 from exceptions import CheckTokenException
 from exceptions import APIAnswerInvalidException
+from exceptions import APIRateLimitedException
+from exceptions import APIUnavailableException
 
 
+# telegram и requests импортируются там, где нужны: без них модуль
+# загружается заметно быстрее, что важно для запусков с --once.
 logger = logging.getLogger(__name__)
-handler = RotatingFileHandler(
-    'homework.log',
-    maxBytes=500000,
-    backupCount=5,
-    encoding='utf-8'
-)
-logger.addHandler(handler)
-formatter = logging.Formatter(
-    '[%(asctime)s]-[%(name)s]-[%(levelname)s]-%(message)s'
-)
-handler.setFormatter(formatter)
 
 
 load_dotenv()
 PRACTICUM_TOKEN = os.getenv('TOKEN_YA')
 TELEGRAM_TOKEN = os.getenv('TOKEN_BOT')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
-
-PRACTICUM_RETRY_TIME = 600
+ACCOUNTS_FILE = os.getenv('ACCOUNTS_FILE')
+POLL_WORKERS = int(os.getenv('POLL_WORKERS', 32))
+ONCE_PERIOD = int(os.getenv('ONCE_PERIOD', POLL_INTERVAL_DEFAULT))
+PRACTICUM_STREAM = os.getenv('PRACTICUM_STREAM', '') == '1'
+PRACTICUM_STREAM_CHUNK = 64 * 1024
+PRACTICUM_ASYNC = os.getenv('PRACTICUM_ASYNC', '') == '1'
+
+PRACTICUM_CURSOR_OVERLAP = 60 * 5
+PRACTICUM_FALLBACK_WINDOW = 60 * 60 * 24
 PRACTICUM_ENDPOINT = (
     'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 )
 
 PRACTICUM_HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
+CURRENT_DATE_RE = re.compile(rb'"current_date"\s*:\s*(\d+)')
+
+HomeworkError = namedtuple(
+    'HomeworkError', 'index homework_id field reason exception')
+ParsedStatuses = namedtuple('ParsedStatuses', 'messages errors')
+
 HOMEWORK_STATUSES = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
 
+API_DOWN_MESSAGE = (
+    'API ЯндексДомашки недоступно, опрос возобновится после восстановления.'
+)
+API_UP_MESSAGE = 'API ЯндексДомашки снова доступно, опрос возобновлён.'
+
+PRACTICUM_BREAKER = CircuitBreaker()
+PRACTICUM_LIMITER = (
+    TokenBucket(PRACTICUM_RATE, PRACTICUM_BURST) if PRACTICUM_RATE else None
+)
+PROFILER = Profiler()
+NOTIFY_SINKS = FanOut(default_sinks())
+
 
 def send_message(bot, message):
     """
     Отправляет сообщение ботом о домашеней работе.
     В соответствующий чат.
     """
-    logger.debug('send_message(): start')
-    logger.debug(message)
+    send_chat_message(bot, TELEGRAM_CHAT_ID, message)
+
+
+def send_chat_message(bot, chat_id, message):
+    """Отправляет сообщение ботом в чат chat_id."""
+    logger.debug('send_chat_message(): start')
+    logger.debug('%s', message)
     try:
-        bot.send_message(TELEGRAM_CHAT_ID, message)
-        logger.info(f'Бот отправил сообщение "{message}"')
+        bot.send_message(chat_id, message)
+        logger.info('Бот отправил сообщение "%s"', message)
     except Exception as error:
         logger.error(error)
 
 
-def send_messages(bot, messages: set, homework_messages: set):
-    """Отправка сообщений, что получились при очередном цикле while."""
-    logger.debug('send_messages(): start')
-    for message in messages:
-        send_message(bot, message)
-        logger.debug('сообщение отправлено')
-        homework_messages.add(message)
-        logger.debug('сообщение сохранено')
-
-
 def get_api_answer(timestamp):
     """
     Отправляет запрос к ЯндексДомашке.
     Ответ - конвертация из json.
     timestamp - метка времени в формате UnixTime.
     """
-    logger.debug('get_api_answer(): start')
+    return request_api_answer(timestamp, PRACTICUM_HEADERS)
+
+
+def request_api_answer(timestamp, headers):
+    """
+    Отправляет запрос к ЯндексДомашке с заголовками headers.
+    Позволяет опрашивать API от имени разных учётных записей.
+    """
+    logger.debug('request_api_answer(): start')
+    response = request_api_response(timestamp, headers)
+    return decode_api_answer(response)
+
+
+@timed('get_api_answer')
+def request_api_response(timestamp, headers, etag=None, stream=False):
+    """
+    Запрос к ЯндексДомашке без разбора тела ответа.
+    С etag запрос условный: ответ 304 означает, что данные не изменились.
+    С stream тело не скачивается сразу, его читают по кускам.
+    """
+    import requests
+
+    kwargs = {'stream': True} if stream else {}
+    logger.debug('request_api_response(): start')
     params = {'from_date': timestamp}
-    logger.debug(params)
+    logger.debug('%s', params)
+    if etag:
+        headers = {**headers, 'If-None-Match': etag}
+    if PRACTICUM_LIMITER is not None:
+        PRACTICUM_LIMITER.acquire()
     try:
-        response = requests.get(
+        response = http_client.http_get(
             PRACTICUM_ENDPOINT,
-            headers=PRACTICUM_HEADERS,
-            params=params
+            headers=headers,
+            params=params,
+            **kwargs
         )
-        logger.debug(response)
-        code = response.status_code
+        logger.debug('%s', response)
         logger.debug(
-            f'timestamp - {timestamp}, - {dt_dt.fromtimestamp(timestamp)} '
-            f'response status code {code} '
+            'timestamp - %s, - %s response status code %s ',
+            timestamp, Lazy(dt_dt.fromtimestamp, timestamp),
+            response.status_code
         )
-
-        if code != 200:
-            message = (
-                f'response status code {code} '
-            )
-            logger.error(message)
-            raise APIAnswerInvalidException(message)
-
-        return response.json()
+        try:
+            return check_api_response(response, etag)
+        except Exception:
+            response.close()
+            raise
 
     except requests.RequestException as error:
         message = f"RequestException: {error}"
         logger.error(message)
+        raise APIUnavailableException(message)
+
+    except (APIRateLimitedException, APIUnavailableException):
+        raise
+
+    except Exception as error:
+        message = f"API_error: {error}"
+        logger.error(message)
+        raise APIAnswerInvalidException(message)
+
+
+@timed_async('get_api_answer')
+async def request_api_response_async(session, timestamp, headers, etag=None):
+    """
+    Неблокирующий вариант request_api_response для цикла событий.
+    session - async_client.AsyncSession; тело ответа читается целиком.
+    Ошибки те же, что у request_api_response.
+    """
+    import asyncio
+
+    logger.debug('request_api_response_async(): start')
+    params = {'from_date': timestamp}
+    if etag:
+        headers = {**headers, 'If-None-Match': etag}
+    if PRACTICUM_LIMITER is not None:
+        await PRACTICUM_LIMITER.acquire_async()
+    try:
+        response = await session.get(
+            PRACTICUM_ENDPOINT, headers=headers, params=params)
+    except (OSError, asyncio.TimeoutError) as error:
+        message = f'ConnectionError: {error!r}'
+        logger.error(message)
+        raise APIUnavailableException(message)
+    try:
+        return check_api_response(response, etag)
+    except (APIRateLimitedException, APIUnavailableException):
+        raise
+    except Exception as error:
+        message = f"API_error: {error}"
+        logger.error(message)
+        raise APIAnswerInvalidException(message)
+
+
+async def get_api_answer_async(session, timestamp, headers=None):
+    """
+    Неблокирующий вариант get_api_answer.
+    headers - заголовки учётной записи, по умолчанию из окружения.
+    """
+    if headers is None:
+        headers = PRACTICUM_HEADERS
+    response = await request_api_response_async(session, timestamp, headers)
+    return decode_api_answer(response)
+
+
+def check_api_response(response, etag=None):
+    """
+    Учитывает код ответа API и проверяет его.
+    304 на условный запрос (с etag) возвращается как есть,
+    иначе всё, кроме 200, - исключение.
+    """
+    code = response.status_code
+    API_RESPONSES.inc(code=code)
+    if code == HTTPStatus.NOT_MODIFIED and etag:
+        return response
+
+    check_availability(response)
+
+    if code != 200:
+        message = (
+            f'response status code {code} '
+        )
+        logger.error(message)
         raise APIAnswerInvalidException(message)
 
+    return response
+
+
+def check_availability(response):
+    """
+    Проверяет, что API не ограничило частоту запросов и не упало.
+    На 429 общий ограничитель приостанавливается на Retry-After.
+    """
+    code = response.status_code
+    if code == HTTPStatus.TOO_MANY_REQUESTS:
+        retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+        if PRACTICUM_LIMITER is not None:
+            PRACTICUM_LIMITER.pause(retry_after)
+        message = f'response status code {code}, retry after {retry_after}'
+        logger.warning(message)
+        raise APIRateLimitedException(message, retry_after)
+    if code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+        message = f'response status code {code} '
+        logger.error(message)
+        raise APIUnavailableException(message)
+
+
+def decode_api_answer(response):
+    """Конвертация ответа ЯндексДомашки из json."""
+    try:
+        return response.json()
     except Exception as error:
         message = f"API_error: {error}"
         logger.error(message)
         raise APIAnswerInvalidException(message)
 
 
+def payload_digest(content):
+    """
+    Хэш тела ответа без поля current_date.
+    current_date меняется при каждом запросе, остальное - только
+    при изменении домашних работ.
+    """
+    return hashlib.blake2b(
+        CURRENT_DATE_RE.sub(b'', content), digest_size=16).hexdigest()
+
+
+@timed('check_response')
 def check_response(response):
     """
     Проверяет ответ от Яндекс домашки на соответствие ожидаемому.
     На входе должен быть Dict.
     """
     logger.debug('check_response(): start')
-    logger.debug(response)
+    logger.debug('%s', Short(response))
 
     if not isinstance(response, dict):
         message = f'На вход функции подан тип "{type(response)}" вместо "dict"'
@@ -125,7 +317,7 @@ def check_response(response):
 
     logger.debug('response is "dict"')
     homeworks = response.get('homeworks')
-    logger.debug(homeworks)
+    logger.debug('%s', Short(homeworks))
 
     if not isinstance(homeworks, list):
         message = (
@@ -135,7 +327,7 @@ def check_response(response):
         raise TypeError(message)
 
     logger.debug('homeworks is list')
-    logger.info(f'В ответе {len(homeworks)} домашних работ')
+    logger.info('В ответе %s домашних работ', len(homeworks))
     return homeworks
 
 
@@ -144,36 +336,105 @@ def parse_status(homework):
     Ищем в словаре homework имя домашней работы и её статус.
     На выход выдаём текст для отправки.
     """
-    logger.debug('parse_status(): start')
-    logger.debug(homework)
+    message, error = render_status(homework)
+    if error is not None:
+        logger.error('%s', error.reason)
+        raise error.exception(error.reason)
+    logger.debug('%s', message)
+    return message
 
-    homework_name = homework.get('homework_name')
-    logger.debug(homework_name)
 
-    if homework_name is None:
-        message = 'homework_name нет в ответе от сервера'
-        logger.error(message)
-        raise KeyError(message)
-
-    homework_status = homework.get('status')
-    logger.debug(homework_status)
+def render_status(homework, index=0):
+    """
+    Проверка записи о работе и текст уведомления без исключений.
+    Возвращает (текст, None) или (None, HomeworkError).
+    """
+    record, error = validate_homework(homework, index)
+    if error is not None:
+        return None, error
+    return render_message(record), None
 
-    if homework_status is None:
-        message = 'homework_status нет в ответе от сервера'
-        logger.error(message)
-        raise APIAnsverWrongData(message)
 
-    verdict = HOMEWORK_STATUSES.get(homework_status)
-    logger.debug(verdict)
+@timed('parse_status')
+def validate_homework(homework, index=0):
+    """
+    Проверяет запись о работе из ответа API без исключений.
+    Возвращает (HomeworkRecord, None) или (None, HomeworkError).
+    """
+    if not isinstance(homework, dict):
+        error = HomeworkError(
+            index, None, 'homework', 'запись о работе не является словарём',
+            TypeError)
+    elif homework.get('homework_name') is None:
+        error = HomeworkError(
+            index, homework.get('id'), 'homework_name',
+            'homework_name нет в ответе от сервера', KeyError)
+    elif homework.get('status') is None:
+        error = HomeworkError(
+            index, homework.get('id'), 'status',
+            'homework_status нет в ответе от сервера', APIAnsverWrongData)
+    elif Status.parse(homework['status']) is None:
+        error = HomeworkError(
+            index, homework.get('id'), 'status',
+            'homework_status в ответе от сервера не опознан',
+            APIAnsverWrongData)
+    else:
+        homework_name = homework['homework_name']
+        return HomeworkRecord(
+            homework.get('id', homework_name),
+            homework_name,
+            Status.parse(homework['status']),
+            homework.get('date_updated'),
+        ), None
+    STAGE_EXCEPTIONS.inc(
+        stage='parse_status', exception=error.exception.__name__)
+    return None, error
+
+
+def render_message(record):
+    """Текст уведомления о смене статуса работы record."""
+    verdict = HOMEWORK_STATUSES[record.status.label]
+    return (
+        f'Изменился статус проверки работы "{record.homework_name}". '
+        f'{verdict}'
+    )
 
-    if verdict is None:
-        message = 'homework_status в ответе от сервера не опознан'
-        logger.error(message)
-        raise APIAnsverWrongData(message)
 
-    message = f'Изменился статус проверки работы "{homework_name}". {verdict}'
-    logger.debug(message)
-    return message
+def parse_statuses(homeworks):
+    """
+    Пакетный вариант parse_status для списка из check_response.
+    Проверяет все записи за один проход без исключений и возвращает
+    ParsedStatuses: тексты уведомлений и ошибки по записям.
+    """
+    messages = []
+    errors = []
+    for index, homework in enumerate(homeworks):
+        message, error = render_status(homework, index)
+        if error is None:
+            messages.append(message)
+        else:
+            errors.append(error)
+    logger.debug(
+        'parse_statuses(): %s уведомлений, %s ошибок',
+        len(messages), len(errors))
+    return ParsedStatuses(messages, errors)
+
+
+def next_timestamp(response, timestamp, start_while):
+    """
+    Курсор для следующего запроса.
+    Это current_date из ответа API минус небольшой запас
+    на случай расхождения часов.
+    Без current_date запрашиваем окно PRACTICUM_FALLBACK_WINDOW.
+    Курсор никогда не сдвигается назад.
+    """
+    current_date = response.get('current_date')
+    if isinstance(current_date, int) and not isinstance(current_date, bool):
+        cursor = current_date - PRACTICUM_CURSOR_OVERLAP
+    else:
+        logger.warning('В ответе API нет корректного current_date')
+        cursor = start_while - PRACTICUM_FALLBACK_WINDOW
+    return max(cursor, timestamp)
 
 
 def check_tokens():
@@ -199,55 +460,452 @@ def check_tokens():
     return result
 
 
-def main():
-    """Основная логика работы бота."""
-    logger.debug('main(): start')
-    if not check_tokens():
+def poll_account(bot, account, clock=SYSTEM_CLOCK):
+    """
+    Один цикл опроса для учётной записи account.
+    Новые сообщения отправляются в чат учётной записи
+    через bot - telegram.Bot или Outbox.
+    """
+    logger.debug('poll_account(): start %s', account)
+    now = clock.time()
+    if not allow_poll(bot, account, now):
+        return
+    start_while = int(now)
+    error_messages = set()
+    try:
+        for homework in fetch_homeworks(account, start_while):
+            handle_homework(bot, account, homework, error_messages)
+    except Exception as error:
+        finish_poll(bot, account, clock, now, error_messages, error)
+    else:
+        finish_poll(bot, account, clock, now, error_messages)
+
+
+async def poll_account_async(session, bot, account, clock=SYSTEM_CLOCK):
+    """
+    Неблокирующий вариант poll_account для цикла событий.
+    Запрос идёт через session (async_client.AsyncSession), разбор
+    и отправка сообщений - те же, что в poll_account.
+    AsyncSession читает ответ целиком, поэтому опросы, которые
+    читаются потоково (первый опрос всей истории, PRACTICUM_STREAM),
+    выполняются poll_account в пуле потоков цикла событий.
+    """
+    logger.debug('poll_account_async(): start %s', account)
+    if PRACTICUM_STREAM or not account.timestamp:
+        import asyncio
+
+        await asyncio.get_running_loop().run_in_executor(
+            None, PROFILER.wrap(poll_account), bot, account, clock)
+        return
+    now = clock.time()
+    if not allow_poll(bot, account, now):
+        return
+    start_while = int(now)
+    error_messages = set()
+    try:
+        response = await request_api_response_async(
+            session, account.timestamp, account.headers, account.etag)
+        for homework in read_homeworks(account, response, start_while):
+            handle_homework(bot, account, homework, error_messages)
+    except Exception as error:
+        finish_poll(bot, account, clock, now, error_messages, error)
+    else:
+        finish_poll(bot, account, clock, now, error_messages)
+
+
+def allow_poll(bot, account, now):
+    """
+    Разрешает ли автомат защиты API опрос сейчас.
+    Если нет, сообщает о недоступности API и назначает следующий опрос.
+    """
+    breaker = PRACTICUM_BREAKER
+    if breaker.allow(now):
+        return True
+    notify_api_state(bot, account, down=True)
+    account.next_poll = (
+        max(breaker.retry_at, now) + with_jitter(POLL_INTERVAL_ACTIVE))
+    return False
+
+
+def finish_poll(bot, account, clock, now, error_messages, error=None):
+    """
+    Завершает опрос, начатый в now, с исходом error.
+    Исход учитывается в автомате защиты API, затем отправляется
+    сводка ошибок и назначается следующий опрос учётной записи.
+    """
+    breaker = PRACTICUM_BREAKER
+    not_before = 0
+    if isinstance(error, APIUnavailableException):
+        logger.warning('API недоступно для %s: %s', account, error)
+        breaker.record_failure(clock.time())
+    else:
+        breaker.record_success()
+        if isinstance(error, APIRateLimitedException):
+            logger.warning(
+                'API ограничило частоту для %s: %s', account, error)
+            not_before = now + error.retry_after
+        elif error is not None:
+            error_messages.add(error_event(error))
+    notify_errors(bot, account, error_messages, clock.time())
+
+    account.interval = next_interval(account.statuses, account.interval)
+    account.next_poll = max(
+        int(now) + with_jitter(account.interval), not_before)
+    retry_at = breaker.retry_at
+    notify_api_state(bot, account, down=bool(retry_at))
+    if retry_at:
+        account.next_poll = retry_at
+
+
+def notify_errors(bot, account, error_messages, now):
+    """
+    Учитывает ошибки опроса (ErrorEvent) в сводке учётной записи.
+    Сводка отправляется в чат, если подошёл её срок.
+    """
+    for event in error_messages:
+        account.errors.add(event, now)
+    digest = account.errors.digest(now)
+    if digest is not None:
+        send_chat_message(bot, account.chat_id, digest)
+        MESSAGES.inc(result='sent')
+
+
+def notify_api_state(bot, account, down):
+    """
+    Сообщает в чат учётной записи о недоступности или восстановлении API.
+    Каждое изменение сообщается один раз.
+    """
+    if account.api_down == down:
+        return
+    account.api_down = down
+    send_chat_message(
+        bot, account.chat_id, API_DOWN_MESSAGE if down else API_UP_MESSAGE)
+    MESSAGES.inc(result='sent')
+
+
+def handle_homework(bot, account, homework, error_messages):
+    """
+    Отправляет уведомление о работе, если её статус изменился.
+    Запись API сравнивается с последним известным статусом той же
+    работы (account.tracker); ключ дедупликации проверяется и текст
+    строится только для работ, у которых есть переход статуса.
+    Ошибки разбора складываются в error_messages как ErrorEvent.
+    """
+    record, error = validate_homework(homework)
+    if error is not None:
+        error_messages.add(ErrorEvent(
+            error.exception.__name__, 'validate_homework', error.reason))
+        return
+    transition = account.tracker.observe(record)
+    if transition is None:
+        return
+    logger.debug('Переход статуса: %s', transition)
+    key = homework_key(record)
+    if key in account.sent:
+        MESSAGES.inc(result='deduplicated')
+        return
+    notify_once(bot, account, key, render_message(record), transition)
+
+
+def fetch_homeworks(account, start_while):
+    """
+    Запрашивает домашние работы учётной записи и сдвигает её курсор.
+    Если ответ не изменился с прошлого опроса, возвращает пустой список,
+    не разбирая JSON и не проверяя домашние работы.
+    При первом опросе (вся история) или с PRACTICUM_STREAM
+    работы разбираются потоково, по одной.
+    """
+    stream = PRACTICUM_STREAM or not account.timestamp
+    response = request_api_response(
+        account.timestamp, account.headers, account.etag, stream)
+    if stream:
+        return stream_homeworks(account, response, start_while)
+    return read_homeworks(account, response, start_while)
+
+
+def read_homeworks(account, response, start_while):
+    """
+    Домашние работы из прочитанного целиком ответа API.
+    Если ответ не изменился с прошлого опроса, возвращает пустой список.
+    """
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        POLLS.inc(payload='unchanged')
+        return []
+
+    account.etag = response.headers.get('ETag')
+    content = response.content
+    digest = payload_digest(content)
+    if digest == account.payload_digest:
+        POLLS.inc(payload='unchanged')
+        current_date = CURRENT_DATE_RE.search(content)
+        if current_date is not None:
+            account.timestamp = next_timestamp(
+                {'current_date': int(current_date.group(1))},
+                account.timestamp, start_while)
+        return []
+
+    answer = decode_api_answer(response)
+    homeworks = check_response(answer)
+    account.timestamp = next_timestamp(answer, account.timestamp, start_while)
+    account.payload_digest = digest
+    POLLS.inc(payload='changed')
+    return homeworks
+
+
+def stream_homeworks(account, response, start_while):
+    """
+    Отдаёт работы из тела ответа по мере чтения.
+    Курсор учётной записи сдвигается после разбора всего ответа.
+    """
+    try:
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            POLLS.inc(payload='unchanged')
+            return
+        account.etag = response.headers.get('ETag')
+        homeworks = HomeworkStream(
+            response.iter_content(PRACTICUM_STREAM_CHUNK))
+        yield from homeworks
+    finally:
+        response.close()
+    logger.info('В ответе %s домашних работ', homeworks.count)
+    account.timestamp = next_timestamp(
+        {'current_date': homeworks.current_date},
+        account.timestamp, start_while)
+    account.payload_digest = None
+    POLLS.inc(payload='streamed')
+
+
+def notify_once(bot, account, key, message, transition=None):
+    """
+    Рассылает уведомление во все приёмники и запоминает его ключ.
+    Приёмники NOTIFY_SINKS: чат учётной записи, общий чат, HTTP.
+    """
+    logger.info('Уведомление для чата %s: "%s"', account.chat_id, message)
+    NOTIFY_SINKS.publish(bot, Notification(
+        account.account_id, account.chat_id, message, transition))
+    account.sent.add(key)
+    MESSAGES.inc(result='sent')
+
+
+def poll_accounts(bot, accounts, executor, clock=SYSTEM_CLOCK):
+    """
+    Опрашивает все учётные записи параллельно в пуле потоков executor.
+    С async_client.AsyncPoller вместо пула потоков опросы идут
+    корутинами poll_account_async в одном цикле событий.
+    Ошибка одной учётной записи не прерывает опрос остальных.
+    """
+    logger.debug('poll_accounts(): start, %s accounts', len(accounts))
+    if getattr(executor, 'coroutines', False):
+        poll = PROFILER.wrap_async(poll_account_async)
+    else:
+        poll = PROFILER.wrap(poll_account)
+    futures = [
+        executor.submit(poll, bot, account, clock)
+        for account in accounts
+    ]
+    for account, future in zip(accounts, futures):
+        error = future.exception()
+        if error is not None:
+            logger.error('Сбой опроса %s: %s', account, error)
+            account.next_poll = (
+                clock.time() + with_jitter(account.interval))
+
+
+def get_accounts(dedup):
+    """
+    Список учётных записей для опроса.
+    Берётся из ACCOUNTS_FILE, иначе - одна запись из переменных окружения.
+    """
+    if ACCOUNTS_FILE:
+        return load_accounts(ACCOUNTS_FILE, dedup)
+    return [Account(PRACTICUM_TOKEN, TELEGRAM_CHAT_ID, dedup)]
+
+
+def run_cycle(outbox, schedule, executor, dedup, clock=SYSTEM_CLOCK,
+              state=None):
+    """
+    Один проход основного цикла.
+    Опрашивает учётные записи из schedule (PollScheduler), у которых
+    подошёл срок, и возвращает их в очередь с новыми сроками. Ставит
+    накопленные сообщения в очередь отправки, сохраняет состояние
+    опрошенных записей в state (StateStore, см. save_state)
+    и чистит хранилище.
+    Возвращает время ближайшего следующего опроса.
+    """
+    now = clock.time()
+    start_while = int(now)
+    logger.debug('while begin - %s', start_while)
+    due = schedule.pop_due(now)
+    if due:
+        logger.debug(
+            'К опросу %s учётных записей, наибольшее отставание %.1f с',
+            len(due), LOOP_LAG.get())
+    poll_accounts(outbox, due, executor, clock)
+    for account in due:
+        schedule.add(account)
+    outbox.flush()
+    if state is not None:
+        save_state(state, due)
+    logger.info('HTTP: %s', http_client.get_stats())
+    logger.info(
+        'Опросы: изменённых %s, без изменений %s',
+        POLLS.get(payload='changed'), POLLS.get(payload='unchanged'))
+    dedup.prune()
+    return schedule.next_deadline(default=start_while + POLL_INTERVAL_DEFAULT)
+
+
+def save_state(state, accounts):
+    """
+    Сохраняет состояние опроса accounts в state.
+    Сбой сохранения пишется в лог и не останавливает цикл: записи
+    сохранятся при следующем опросе, а при перезапуске опрос
+    продолжится с последнего сохранённого состояния.
+    """
+    try:
+        state.save(accounts)
+    except Exception as error:
+        logger.error('Не удалось сохранить состояние опроса: %s', error)
+
+
+def run_loop(outbox, schedule, executor, dedup, clock=SYSTEM_CLOCK,
+             cycles=None, state=None):
+    """
+    Основной цикл: проходы run_cycle со сном до ближайшего опроса.
+    clock - источник времени и сна; с clock.VirtualClock цикл
+    симулирует дни работы за секунды. cycles - сколько проходов
+    сделать (None - бесконечно). state - куда сохранять состояние.
+    Пока PROFILER.remaining не ноль, проходы профилируются.
+    """
+    cycle = 0
+    while cycles is None or cycle < cycles:
+        if PROFILER.remaining:
+            deadline = PROFILER.profile(
+                run_cycle, outbox, schedule, executor, dedup, clock, state)
+        else:
+            deadline = run_cycle(
+                outbox, schedule, executor, dedup, clock, state)
+        clock.sleep(sleep_time(deadline, clock.time()))
+        logger.debug('while end - %s', int(clock.time()))
+        cycle += 1
+
+
+def setup_traffic():
+    """
+    Включает воспроизведение и (или) запись обменов с API.
+    Ответы берутся из PRACTICUM_REPLAY, обмены пишутся в PRACTICUM_RECORD.
+    Возвращает True, если включено хотя бы одно из них.
+    """
+    from replay import PRACTICUM_RECORD
+    from replay import PRACTICUM_REPLAY
+    from replay import Recorder
+    from replay import ReplaySession
+
+    if PRACTICUM_REPLAY:
+        http_client.use_session(ReplaySession(PRACTICUM_REPLAY))
+        logger.info('Ответы API воспроизводятся из %s', PRACTICUM_REPLAY)
+    if PRACTICUM_RECORD:
+        http_client.set_recorder(Recorder(PRACTICUM_RECORD))
+        logger.info('Обмены с API записываются в %s', PRACTICUM_RECORD)
+    return bool(PRACTICUM_REPLAY or PRACTICUM_RECORD)
+
+
+def create_executor(intercepted=False):
+    """
+    Пул для опроса учётных записей.
+    Обычно это пул потоков, с PRACTICUM_ASYNC - цикл событий asyncio.
+    Запись и воспроизведение трафика (intercepted) работают через
+    сессию requests, поэтому с ними всегда используются потоки.
+    """
+    if PRACTICUM_ASYNC and not intercepted:
+        from async_client import AsyncPoller
+
+        logger.info('Опрос API идёт в цикле событий asyncio')
+        return AsyncPoller()
+    return ThreadPoolExecutor(max_workers=POLL_WORKERS)
+
+
+def require_tokens():
+    """
+    Проверяет переменные окружения, без которых бот не запустится.
+    С ACCOUNTS_FILE достаточно токена бота.
+    """
+    if ACCOUNTS_FILE:
+        if not TELEGRAM_TOKEN:
+            raise CheckTokenException(
+                "Отсутствует переменная окружения TOKEN_BOT")
+    elif not check_tokens():
         raise CheckTokenException(
             "Отсутствует одна из обязательных переменных окружения")
-    bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    current_timestamp = 0
-    logger.debug('current_timestamp = 0')
-    homework_messages = set()
-    error_messages_cache = set()
-    while True:
-        error_messages = set()
-        start_while = int(time.time())
-        logger.debug(f'while begin - {start_while}')
-        try:
-            response = get_api_answer(current_timestamp)
-            homeworks = check_response(response)
-        except Exception as error:
-            homeworks = []
-            message = f'Сбой в работе программы: {error}'
-            error_messages.add(message)
-
-        messages = set()
-        for homework in homeworks:
-            try:
-                message = parse_status(homework)
-                messages.add(message)
-            except Exception as error:
-                message = f'Сбой в работе программы: {error}'
-                error_messages.add(message)
-
-        new_homework_messages = messages.difference(homework_messages)
-        new_error_messages = error_messages.difference(error_messages_cache)
-        logger.debug(new_homework_messages)
-        logger.debug(new_error_messages)
-
-        send_messages(bot, new_homework_messages, homework_messages)
-        send_messages(bot, new_error_messages, error_messages_cache)
-        logger.debug(homework_messages)
-        logger.debug(error_messages_cache)
-
-        current_timestamp = start_while - 60 * 60 * 24
-        end_while = int(time.time())
-        time.sleep(PRACTICUM_RETRY_TIME - (end_while - start_while))
-        logger.debug(f'while end - {int(time.time())}')
+
+
+def run_once(outbox, accounts, executor, dedup, state, clock=SYSTEM_CLOCK,
+             period=ONCE_PERIOD):
+    """
+    Один проход для запуска по расписанию (cron, serverless).
+    Опрашивает учётные записи, срок которых наступит раньше следующего
+    запуска через period секунд, дожидается отправки сообщений,
+    сохраняет состояние и закрывает хранилища.
+    """
+    now = clock.time()
+    for account in accounts:
+        if account.next_poll <= now + period:
+            account.next_poll = min(account.next_poll, now)
+    run_cycle(
+        outbox, PollScheduler(accounts), executor, dedup, clock, state=state)
+    NOTIFY_SINKS.close(timeout=60)
+    outbox.close(timeout=60)
+    state.close()
+    dedup.close()
+
+
+def parse_args(argv=()):
+    """Параметры запуска из командной строки."""
+    parser = argparse.ArgumentParser(
+        description='Бот, присылающий статусы домашних работ ЯндексДомашки.')
+    parser.add_argument(
+        '--once', action='store_true',
+        help='загрузить состояние, выполнить один цикл опроса, '
+             'отправить сообщения, сохранить состояние и выйти')
+    return parser.parse_args(argv)
+
+
+def main(argv=()):
+    """Основная логика работы бота."""
+    import telegram
+
+    options = parse_args(argv)
+    module_loggers = [
+        logging.getLogger(name) for name in ('outbox', 'profiling', 'sinks')]
+    for module_logger in module_loggers:
+        module_logger.setLevel(logging.INFO)
+    setup_logging(logger, *module_loggers)
+    logger.info('=======START=======')
+    require_tokens()
+    intercepted = setup_traffic()
+    outbox = Outbox(telegram.Bot(token=TELEGRAM_TOKEN))
+    outbox.start()
+    dedup = DedupStore(DEDUP_DB)
+    state = StateStore(STATE_DB)
+    accounts = get_accounts(dedup)
+    restored = state.load(accounts)
+    logger.info(
+        'Учётных записей для опроса: %s, с сохранённым состоянием: %s',
+        len(accounts), restored)
+    with create_executor(intercepted) as executor:
+        if options.once:
+            run_once(outbox, accounts, executor, dedup, state)
+            return
+        spread_start(
+            [account for account in accounts if not account.next_poll],
+            SYSTEM_CLOCK.time())
+        PROFILER.install_signal()
+        if METRICS_PORT:
+            start_metrics_server(METRICS_PORT)
+            logger.info('Метрики доступны на порту %s', METRICS_PORT)
+        run_loop(
+            outbox, PollScheduler(accounts), executor, dedup, state=state)
 
 
 if __name__ == '__main__':
     logger.setLevel(logging.INFO)
-    logger.info('=======START=======')
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 30))
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 32))
+
+_session = None
+_session_lock = threading.Lock()
+_recorder = None
+
+
+class RequestStats:
+    """Счётчики запросов и их длительности, потокобезопасные."""
+
+    def __init__(self):
+        """Создаёт пустые счётчики."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Обнуляет счётчики."""
+        with self._lock:
+            self.requests = 0
+            self.total_time = 0.0
+            self.max_time = 0.0
+            self.last_time = 0.0
+
+    def observe(self, seconds):
+        """Учитывает один запрос длительностью seconds."""
+        with self._lock:
+            self.requests += 1
+            self.total_time += seconds
+            self.last_time = seconds
+            self.max_time = max(self.max_time, seconds)
+
+    def as_dict(self):
+        """Снимок счётчиков в виде словаря."""
+        with self._lock:
+            average = self.total_time / self.requests if self.requests else 0
+            return {
+                'requests': self.requests,
+                'latency_avg': round(average, 4),
+                'latency_max': round(self.max_time, 4),
+                'latency_last': round(self.last_time, 4),
+            }
+
+
+STATS = RequestStats()
+
+
+def create_session(pool_size=HTTP_POOL_SIZE):
+    """
+    Создаёт сессию с keep-alive пулом соединений.
+    pool_size - сколько keep-alive соединений к одному хосту хранится
+    в пуле. Если все они заняты, запрос открывает новое соединение,
+    которое после ответа закрывается, а не ждёт свободного: иначе
+    невозвращённое в пул соединение навсегда занимало бы место в нём.
+    Число одновременных запросов ограничивает пул потоков опроса.
+    requests импортируется здесь, при первом запросе, а не при запуске.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_size,
+        pool_block=False,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """Общая для всего процесса сессия, создаётся при первом обращении."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def use_session(session):
+    """
+    Подменяет общую сессию, например на replay.ReplaySession.
+    Для запросов нужен метод get как у requests.Session; если у session
+    нет адаптеров (adapters), статистика соединений будет нулевой.
+    """
+    global _session
+    with _session_lock:
+        _session = session
+
+
+def set_recorder(recorder):
+    """Включает (или с None выключает) запись обменов в recorder."""
+    global _recorder
+    _recorder = recorder
+
+
+def http_get(url, **kwargs):
+    """
+    GET-запрос через общий пул соединений.
+    Если timeout не передан, используются (connect, read) из окружения.
+    При включённой записи запрос и ответ сохраняются.
+    """
+    kwargs.setdefault('timeout', (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+    start = time.monotonic()
+    try:
+        response = get_session().get(url, **kwargs)
+    finally:
+        elapsed = time.monotonic() - start
+        STATS.observe(elapsed)
+    if _recorder is not None:
+        _recorder.record(
+            url, kwargs.get('headers'), kwargs.get('params'), response,
+            elapsed)
+    return response
+
+
+def connection_stats():
+    """
+    Статистика переиспользования соединений по всем пулам сессии.
+    reused - сколько запросов обошлись без нового TCP/TLS соединения.
+    """
+    connections = 0
+    pool_requests = 0
+    adapters = getattr(_session, 'adapters', None)
+    if adapters is not None:
+        for adapter in set(adapters.values()):
+            for key in adapter.poolmanager.pools.keys():
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                connections += pool.num_connections
+                pool_requests += pool.num_requests
+    return {
+        'connections': connections,
+        'reused': max(pool_requests - connections, 0),
+    }
+
+
+def get_stats():
+    """Задержки запросов и переиспользование соединений одним словарём."""
+    stats = STATS.as_dict()
+    stats.update(connection_stats())
+    return stats
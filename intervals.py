@@ -0,0 +1,48 @@
+import os
+import random
+
+from records import Status
+
+POLL_INTERVAL_ACTIVE = int(os.getenv('POLL_INTERVAL_ACTIVE', 120))
+POLL_INTERVAL_DEFAULT = int(os.getenv('POLL_INTERVAL_DEFAULT', 600))
+POLL_INTERVAL_IDLE_MAX = int(os.getenv('POLL_INTERVAL_IDLE_MAX', 3600))
+POLL_JITTER = float(os.getenv('POLL_JITTER', 0.1))
+POLL_START_SPREAD = int(os.getenv('POLL_START_SPREAD', POLL_INTERVAL_DEFAULT))
+
+ACTIVE_STATUSES = frozenset((Status.REVIEWING,))
+IDLE_STATUSES = frozenset((Status.APPROVED,))
+
+
+def next_interval(statuses, interval=POLL_INTERVAL_DEFAULT):
+    """
+    Интервал до следующего опроса по известным статусам работ.
+    Пока работа на проверке - опрашиваем часто. Если работ нет
+    или все приняты - удваиваем прошлый интервал до
+    POLL_INTERVAL_IDLE_MAX. В остальных случаях - обычный интервал.
+    """
+    values = set(statuses.values())
+    if values & ACTIVE_STATUSES:
+        return POLL_INTERVAL_ACTIVE
+    if values <= IDLE_STATUSES:
+        interval = max(interval, POLL_INTERVAL_DEFAULT)
+        return min(interval * 2, POLL_INTERVAL_IDLE_MAX)
+    return POLL_INTERVAL_DEFAULT
+
+
+def with_jitter(interval, jitter=POLL_JITTER, rng=random.random):
+    """Интервал со случайным отклонением в пределах ±jitter доли."""
+    return interval * (1 + jitter * (2 * rng() - 1))
+
+
+def spread_start(accounts, now, window=POLL_START_SPREAD):
+    """
+    Разносит первые опросы учётных записей равномерно по окну window.
+    Так после запуска они не приходят в API одновременно.
+    """
+    for number, account in enumerate(accounts):
+        account.next_poll = now + window * number / len(accounts)
+
+
+def sleep_time(deadline, now):
+    """Сколько спать до deadline; никогда не меньше нуля."""
+    return max(deadline - now, 0)
@@ -0,0 +1,109 @@
+import atexit
+import logging
+import os
+import queue
+import reprlib
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from logging.handlers import RotatingFileHandler
+
+LOG_FILE = os.getenv('LOG_FILE', 'homework.log')
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+LOG_FORMAT = '[%(asctime)s]-[%(name)s]-[%(levelname)s]-%(message)s'
+
+_short_repr = reprlib.Repr()
+_short_repr.maxlevel = 3
+_short_repr.maxdict = 5
+_short_repr.maxlist = 5
+_short_repr.maxstring = 200
+_short_repr.maxother = 200
+
+
+class Short:
+    """
+    Обёртка для логирования больших объектов.
+    Превращается в строку только если запись действительно пишется,
+    причём в урезанном виде: не больше пяти элементов на уровень.
+    """
+
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        """Запоминает объект без какой-либо обработки."""
+        self.obj = obj
+
+    def __str__(self):
+        """Урезанное представление объекта."""
+        return _short_repr.repr(self.obj)
+
+
+class Lazy:
+    """Значение для лога, вычисляемое только если запись пишется."""
+
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func, *args):
+        """Запоминает функцию и её аргументы."""
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        """Вызывает функцию и возвращает результат строкой."""
+        return str(self.func(*self.args))
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Кладёт записи в очередь без форматирования.
+    Форматирование и запись на диск происходят в потоке QueueListener.
+    Если очередь переполнена, запись отбрасывается, а не блокирует
+    поток опроса.
+    """
+
+    def __init__(self, log_queue):
+        """Создаёт обработчик поверх очереди log_queue."""
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        """Запись передаётся как есть, без форматирования в этом потоке."""
+        return record
+
+    def enqueue(self, record):
+        """Кладёт запись в очередь или отбрасывает её."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class Listener(QueueListener):
+    """QueueListener, который можно останавливать повторно."""
+
+    def stop(self):
+        """Дописывает очередь и останавливает поток; повторно - ничего."""
+        if self._thread is not None:
+            super().stop()
+
+
+def setup_logging(*loggers, path=LOG_FILE, queue_size=LOG_QUEUE_SIZE):
+    """
+    Подключает к loggers запись в ротируемый файл через общую очередь.
+    Возвращает запущенный QueueListener; он останавливается при выходе.
+    """
+    file_handler = RotatingFileHandler(
+        path,
+        maxBytes=500000,
+        backupCount=5,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue = queue.Queue(queue_size)
+    queue_handler = DroppingQueueHandler(log_queue)
+    for logger in loggers:
+        logger.addHandler(queue_handler)
+    listener = Listener(
+        log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
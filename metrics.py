@@ -0,0 +1,294 @@
+import functools
+import os
+import threading
+import time
+
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = os.getenv('METRICS_PORT')
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30,
+)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    body = ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + body + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Метрика с именованными метками; значения хранятся по кортежам меток."""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        """Создаёт метрику без значений."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        """Строки метрики в текстовом формате Prometheus."""
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key, value):
+        labels = _format_labels(self.labelnames, key)
+        return [f'{self.name}{labels} {_format_value(value)}']
+
+
+class Counter(Metric):
+    """Монотонно растущий счётчик."""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Увеличивает счётчик с метками labels."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        """Текущее значение счётчика."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    """Произвольное текущее значение."""
+
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        """Устанавливает значение."""
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def get(self, **labels):
+        """Текущее значение."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(Metric):
+    """Гистограмма длительностей с фиксированными границами корзин."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 buckets=DEFAULT_BUCKETS):
+        """Создаёт гистограмму с границами buckets."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        """Учитывает одно наблюдение."""
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            counts = state[0]
+            for number, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[number] += 1
+                    break
+            state[1] += 1
+            state[2] += value
+
+    def count(self, **labels):
+        """Сколько наблюдений учтено."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[1] if state else 0
+
+    def _render_value(self, key, value):
+        counts, total, amount = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            labels = _format_labels(
+                self.labelnames, key, [('le', _format_value(bound))])
+            lines.append(f'{self.name}_bucket{labels} {cumulative}')
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f'{self.name}_count{labels} {total}')
+        lines.append(f'{self.name}_sum{labels} {_format_value(amount)}')
+        return lines
+
+
+class Registry:
+    """Набор метрик, отдаваемых одним запросом."""
+
+    def __init__(self):
+        """Создаёт пустой набор."""
+        self._metrics = []
+
+    def register(self, metric):
+        """Добавляет метрику и возвращает её."""
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Все метрики в текстовом формате Prometheus."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'homework_stage_seconds',
+    'Длительность этапов опроса и отправки.',
+    ('stage',),
+))
+STAGE_EXCEPTIONS = REGISTRY.register(Counter(
+    'homework_exceptions_total',
+    'Исключения по этапам и классам.',
+    ('stage', 'exception'),
+))
+API_RESPONSES = REGISTRY.register(Counter(
+    'homework_api_responses_total',
+    'Ответы API ЯндексДомашки по HTTP-кодам.',
+    ('code',),
+))
+MESSAGES = REGISTRY.register(Counter(
+    'homework_messages_total',
+    'Уведомления: отправленные и отброшенные как повторы.',
+    ('result',),
+))
+POLLS = REGISTRY.register(Counter(
+    'homework_polls_total',
+    'Опросы по тому, изменился ли ответ API.',
+    ('payload',),
+))
+LOOP_LAG = REGISTRY.register(Gauge(
+    'homework_loop_lag_seconds',
+    'Наибольшее отставание опроса от срока в последнем проходе цикла.',
+))
+TRANSITIONS = REGISTRY.register(Counter(
+    'homework_status_transitions_total',
+    'Смены статусов работ: из какого (new - новая работа) в какой.',
+    ('old', 'new'),
+))
+POLL_LAG = REGISTRY.register(Histogram(
+    'homework_poll_lag_seconds',
+    'Отставание опроса учётной записи от её запланированного срока.',
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600),
+))
+SINK_DELIVERIES = REGISTRY.register(Counter(
+    'homework_sink_deliveries_total',
+    'Доставка уведомлений по приёмникам: доставлено, сбой, отброшено.',
+    ('sink', 'result'),
+))
+API_CIRCUIT_OPEN = REGISTRY.register(Gauge(
+    'homework_api_circuit_open',
+    'Опрос API приостановлен автоматом защиты (1) или идёт (0).',
+))
+
+
+def timed(stage):
+    """
+    Декоратор для замера этапа stage.
+    Длительность вызова попадает в STAGE_SECONDS,
+    а исключения считаются в STAGE_EXCEPTIONS по имени класса.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception as error:
+                STAGE_EXCEPTIONS.inc(
+                    stage=stage, exception=type(error).__name__)
+                raise
+            finally:
+                STAGE_SECONDS.observe(
+                    time.perf_counter() - start, stage=stage)
+        return wrapper
+    return decorator
+
+
+def timed_async(stage):
+    """Декоратор timed для корутинных функций."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception as error:
+                STAGE_EXCEPTIONS.inc(
+                    stage=stage, exception=type(error).__name__)
+                raise
+            finally:
+                STAGE_SECONDS.observe(
+                    time.perf_counter() - start, stage=stage)
+        return wrapper
+    return decorator
+
+
+def start_metrics_server(port, host=METRICS_HOST, registry=REGISTRY):
+    """
+    Запускает HTTP-сервер метрик в фоновом потоке.
+    http.server импортируется только здесь: без METRICS_PORT
+    он не нужен и не замедляет запуск.
+    """
+    from http.server import BaseHTTPRequestHandler
+    from http.server import ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Отдаёт метрики по GET /metrics."""
+
+        def do_GET(self):
+            """Ответ на GET-запрос."""
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header(
+                'Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            """Запросы к метрикам не пишутся в stderr."""
+            pass
+
+    server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(
+        target=server.serve_forever, name='metrics', daemon=True)
+    thread.start()
+    return server
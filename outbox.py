@@ -0,0 +1,208 @@
+import heapq
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+
+from metrics import STAGE_EXCEPTIONS
+from metrics import STAGE_SECONDS
+from ratelimit import TokenBucket
+
+TELEGRAM_GLOBAL_RATE = float(os.getenv('TELEGRAM_GLOBAL_RATE', 25))
+TELEGRAM_CHAT_RATE = float(os.getenv('TELEGRAM_CHAT_RATE', 1))
+TELEGRAM_GROUP_RATE = float(os.getenv('TELEGRAM_GROUP_RATE', 20 / 60))
+TELEGRAM_SENDERS = int(os.getenv('TELEGRAM_SENDERS', 2))
+TELEGRAM_MAX_LENGTH = 4096
+TELEGRAM_MAX_ATTEMPTS = 5
+
+logger = logging.getLogger(__name__)
+
+
+class Outbox:
+    """
+    Очередь исходящих сообщений Telegram.
+    Сообщения одного чата, накопленные за цикл опроса, склеиваются
+    в одно и отправляются фоновыми потоками с ограничением частоты:
+    общим для бота и отдельным для каждого чата (для групп, у которых
+    id отрицательный, - group_rate). Сообщение чата, исчерпавшего
+    свой лимит или получившего RetryAfter, откладывается до срока,
+    а поток отправки тем временем занимается другими чатами.
+    Интерфейс send_message совпадает с telegram.Bot,
+    поэтому Outbox можно передавать вместо бота.
+    """
+
+    def __init__(self, bot, senders=TELEGRAM_SENDERS,
+                 global_rate=TELEGRAM_GLOBAL_RATE,
+                 chat_rate=TELEGRAM_CHAT_RATE,
+                 group_rate=TELEGRAM_GROUP_RATE):
+        """Создаёт очередь; отправка начинается после start()."""
+        self.bot = bot
+        self.senders = senders
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.global_bucket = TokenBucket(global_rate)
+        self._chat_buckets = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._deferred = []
+        self._counter = itertools.count()
+        self._threads = []
+        self._unfinished = 0
+        self._done = threading.Condition(self._lock)
+
+    def start(self):
+        """Запускает фоновые потоки отправки."""
+        for number in range(self.senders):
+            thread = threading.Thread(
+                target=self._run, name=f'outbox-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def send_message(self, chat_id, text):
+        """Кладёт сообщение в чат chat_id до ближайшего flush()."""
+        with self._lock:
+            self._pending.setdefault(chat_id, []).append(text)
+
+    def flush(self):
+        """
+        Склеивает накопленные сообщения по чатам и ставит их в очередь.
+        Возвращает число поставленных в очередь сообщений Telegram.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        count = 0
+        for chat_id, messages in pending.items():
+            for text in coalesce(messages):
+                self._put((chat_id, text, 1))
+                count += 1
+        return count
+
+    def join(self, timeout=None):
+        """
+        Ждёт доставки всех сообщений из очереди, включая повторы.
+        Возвращает False, если не дождались за timeout секунд.
+        """
+        with self._done:
+            return self._done.wait_for(
+                lambda: not self._unfinished, timeout)
+
+    def qsize(self):
+        """Сколько сообщений ждут отправки."""
+        return self._queue.qsize()
+
+    def close(self, timeout=None):
+        """Отправляет всё накопленное и останавливает потоки."""
+        self.flush()
+        self.join(timeout)
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _chat_bucket(self, chat_id):
+        with self._lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                is_group = str(chat_id).startswith('-')
+                bucket = TokenBucket(
+                    self.group_rate if is_group else self.chat_rate)
+                self._chat_buckets[chat_id] = bucket
+            return bucket
+
+    def _put(self, item):
+        with self._lock:
+            self._unfinished += 1
+        self._queue.put(item)
+
+    def _defer(self, item, delay):
+        """Вернёт item в очередь через delay секунд."""
+        with self._lock:
+            self._unfinished += 1
+            heapq.heappush(
+                self._deferred,
+                (time.monotonic() + delay, next(self._counter), item))
+
+    def _release_deferred(self):
+        """
+        Возвращает в очередь отложенные сообщения, срок которых наступил.
+        Возвращает, сколько ждать до следующего срока (None - нечего).
+        """
+        now = time.monotonic()
+        ready = []
+        with self._lock:
+            while self._deferred and self._deferred[0][0] <= now:
+                ready.append(heapq.heappop(self._deferred)[2])
+            wait = self._deferred[0][0] - now if self._deferred else None
+        for item in ready:
+            self._queue.put(item)
+        return wait
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self._release_deferred())
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            try:
+                self._deliver(*item)
+            finally:
+                with self._done:
+                    self._unfinished -= 1
+                    self._done.notify_all()
+
+    def _deliver(self, chat_id, text, attempt):
+        chat_bucket = self._chat_bucket(chat_id)
+        delay = chat_bucket.reserve()
+        if delay > 0:
+            self._defer((chat_id, text, attempt), delay)
+            return
+        self.global_bucket.acquire()
+        start = time.perf_counter()
+        try:
+            self.bot.send_message(chat_id, text)
+            logger.debug('Outbox: сообщение доставлено в чат %s', chat_id)
+        except Exception as error:
+            STAGE_EXCEPTIONS.inc(
+                stage='send_message', exception=type(error).__name__)
+            retry_after = getattr(error, 'retry_after', None)
+            if retry_after is None or attempt >= TELEGRAM_MAX_ATTEMPTS:
+                logger.error('Outbox: чат %s: %s', chat_id, error)
+                return
+            logger.warning(
+                'Outbox: Telegram просит подождать %s с в чате %s',
+                retry_after, chat_id)
+            chat_bucket.pause(retry_after)
+            self._defer((chat_id, text, attempt + 1), retry_after)
+        finally:
+            STAGE_SECONDS.observe(
+                time.perf_counter() - start, stage='send_message')
+
+
+def coalesce(messages, max_length=TELEGRAM_MAX_LENGTH):
+    """
+    Склеивает сообщения через пустую строку в блоки не длиннее max_length.
+    Слишком длинное одиночное сообщение режется на части.
+    """
+    blocks = []
+    current = ''
+    for message in messages:
+        while len(message) > max_length:
+            if current:
+                blocks.append(current)
+                current = ''
+            blocks.append(message[:max_length])
+            message = message[max_length:]
+        candidate = f'{current}\n\n{message}' if current else message
+        if len(candidate) > max_length:
+            blocks.append(current)
+            candidate = message
+        current = candidate
+    if current:
+        blocks.append(current)
+    return blocks
@@ -0,0 +1,205 @@
+import logging
+import os
+import signal
+import sys
+import threading
+from datetime import datetime
+
+PROFILE_CYCLES = int(os.getenv('PROFILE_CYCLES', 0))
+PROFILE_SIGNAL_CYCLES = int(os.getenv('PROFILE_SIGNAL_CYCLES', 3))
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+PROFILE_TOP = 30
+# До Python 3.12 cProfile видит только поток, в котором включён,
+# поэтому потоки пула профилируются отдельно; с 3.12 (sys.monitoring)
+# профилировщик основного потока видит все потоки, а второй
+# профилировщик включить нельзя.
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+logger = logging.getLogger('profiling')
+
+
+class Profiler:
+    """
+    Профилирование ближайших проходов основного цикла по запросу.
+    Проход, обёрнутый в profile, выполняется под cProfile и tracemalloc,
+    а результаты пишутся в PROFILE_DIR файлами с отметкой времени:
+    <метка>.prof (pstats) и <метка>.memory.txt (рост памяти по строкам).
+    Пока профилирование не запрошено, цикл платит только за проверку
+    remaining; cProfile и tracemalloc не импортируются.
+    """
+
+    def __init__(self, cycles=PROFILE_CYCLES, directory=PROFILE_DIR):
+        """Профилирует первые cycles проходов (0 - только по запросу)."""
+        self.remaining = cycles
+        self.directory = directory
+        self.active = False
+        self._profiles = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def request(self, cycles=PROFILE_SIGNAL_CYCLES):
+        """
+        Профилирует следующие cycles проходов цикла.
+        Вызывается из обработчика сигнала, поэтому ничего не логирует.
+        """
+        self.remaining = cycles
+
+    def install_signal(self, signum=None, cycles=PROFILE_SIGNAL_CYCLES):
+        """
+        Включает профилирование по сигналу signum (по умолчанию SIGUSR1).
+        На платформах без SIGUSR1 ничего не делает.
+        """
+        if signum is None:
+            signum = getattr(signal, 'SIGUSR1', None)
+            if signum is None:
+                return
+        signal.signal(signum, lambda *_: self.request(cycles))
+
+    def wrap(self, func):
+        """
+        Функция для запуска в потоках пула во время профилирования.
+        Вне профилируемого прохода или там, где профилировщик основного
+        потока видит все потоки, возвращает func без изменений.
+        """
+        if not (self.active and PER_THREAD_PROFILES):
+            return func
+
+        def profiled(*args, **kwargs):
+            profile = self._enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._disable(profile)
+
+        return profiled
+
+    def wrap_async(self, func):
+        """
+        Как wrap, но для корутинной функции func.
+        Корутины одного цикла событий перемежаются в одном потоке,
+        поэтому профилировщик потока цикла включается первой корутиной
+        и выключается, когда завершается последняя.
+        """
+        if not (self.active and PER_THREAD_PROFILES):
+            return func
+
+        async def profiled(*args, **kwargs):
+            self._enter_thread()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self._leave_thread()
+
+        return profiled
+
+    def profile(self, func, *args, **kwargs):
+        """
+        Выполняет func(*args, **kwargs) под профилировщиками.
+        Сбои самого профилирования пишутся в лог и не мешают проходу.
+        """
+        self.remaining -= 1
+        logger.info(
+            'Профилирование прохода цикла, осталось %s', self.remaining)
+        try:
+            session = self._start()
+        except Exception as error:
+            logger.error('Не удалось включить профилирование: %s', error)
+            return func(*args, **kwargs)
+        self.active = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.active = False
+            try:
+                self._finish(*session)
+            except Exception as error:
+                logger.error('Не удалось записать профиль: %s', error)
+
+    def _start(self):
+        import cProfile
+        import tracemalloc
+
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            profile = cProfile.Profile()
+            profile.enable()
+        except Exception:
+            if not tracing:
+                tracemalloc.stop()
+            raise
+        return stamp, tracing, before, profile
+
+    def _finish(self, stamp, tracing, before, profile):
+        import tracemalloc
+
+        profile.disable()
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if not tracing:
+            tracemalloc.stop()
+        with self._lock:
+            profiles, self._profiles = self._profiles, []
+        self.write(stamp, [profile, *profiles],
+                   after.compare_to(before, 'lineno'), current, peak)
+
+    def _enable(self):
+        """Профилировщик текущего потока или None, если включить нельзя."""
+        import cProfile
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return None
+        return profile
+
+    def _disable(self, profile):
+        if profile is None:
+            return
+        profile.disable()
+        with self._lock:
+            self._profiles.append(profile)
+
+    def _enter_thread(self):
+        local = self._local
+        if not getattr(local, 'depth', 0):
+            local.profile = self._enable()
+            local.depth = 0
+        local.depth += 1
+
+    def _leave_thread(self):
+        local = self._local
+        local.depth -= 1
+        if not local.depth:
+            self._disable(local.profile)
+            local.profile = None
+
+    def write(self, stamp, profiles, memory, current, peak):
+        """
+        Пишет статистику одного прохода в файлы с меткой stamp.
+        Профилировщики без данных пропускаются.
+        """
+        import pstats
+
+        stats = None
+        for profile in profiles:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+            except TypeError:
+                continue
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, stamp)
+        if stats is not None:
+            stats.dump_stats(f'{path}.prof')
+        with open(f'{path}.memory.txt', 'w', encoding='utf-8') as file:
+            file.write(f'current={current} peak={peak}\n')
+            for line in memory[:PROFILE_TOP]:
+                file.write(f'{line}\n')
+        logger.info('Профиль прохода цикла записан в %s', path)
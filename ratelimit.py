@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+
+PRACTICUM_RATE = float(os.getenv('PRACTICUM_RATE', 10))
+PRACTICUM_BURST = float(os.getenv('PRACTICUM_BURST', 10))
+RETRY_AFTER_DEFAULT = 60
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты «ведро токенов».
+    rate - токенов в секунду, capacity - размер всплеска.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        """Создаёт полное ведро."""
+        if capacity is None:
+            capacity = max(rate, 1)
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.paused_until = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = max(now - self.updated, 0)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def reserve(self, tokens=1):
+        """
+        Пытается забрать tokens токенов.
+        Возвращает 0, если токены забраны, иначе - сколько секунд подождать.
+        """
+        with self._lock:
+            now = self.clock()
+            if now < self.paused_until:
+                return self.paused_until - now
+            self._refill(now)
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens=1, sleep=time.sleep):
+        """Ждёт, пока не удастся забрать tokens токенов."""
+        delay = self.reserve(tokens)
+        while delay > 0:
+            sleep(delay)
+            delay = self.reserve(tokens)
+
+    async def acquire_async(self, tokens=1):
+        """Как acquire, но ждёт в asyncio.sleep, не блокируя цикл событий."""
+        import asyncio
+
+        delay = self.reserve(tokens)
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.reserve(tokens)
+
+    def pause(self, seconds):
+        """Не выдавать токены seconds секунд (например, по Retry-After)."""
+        with self._lock:
+            now = self.clock()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0
+            self.updated = max(self.updated, self.paused_until)
+
+
+def retry_after_seconds(value, now=None, default=RETRY_AFTER_DEFAULT):
+    """
+    Пауза в секундах по заголовку Retry-After.
+    Заголовок бывает числом секунд или HTTP-датой; если его нет
+    или он не разбирается, возвращается default.
+    """
+    if value is None:
+        return default
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        moment = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return default
+    if now is None:
+        now = time.time()
+    return max(moment - now, 0)
@@ -0,0 +1,31 @@
+import enum
+from collections import namedtuple
+
+
+class Status(enum.IntEnum):
+    """Статус проверки работы; хранится как небольшой целый код."""
+
+    REVIEWING = 1
+    REJECTED = 2
+    APPROVED = 3
+
+    @property
+    def label(self):
+        """Статус в том виде, в каком его отдаёт API."""
+        return _LABELS[self]
+
+    @classmethod
+    def parse(cls, value):
+        """Статус по строке из API или None, если он не опознан."""
+        return _BY_LABEL.get(value)
+
+
+_LABELS = {status: status.name.lower() for status in Status}
+_BY_LABEL = {label: status for status, label in _LABELS.items()}
+
+HomeworkRecord = namedtuple(
+    'HomeworkRecord', 'id homework_name status date_updated')
+HomeworkRecord.__doc__ = """
+Работа из ответа API: только поля, нужные боту.
+Если у работы нет id, вместо него используется homework_name.
+"""
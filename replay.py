@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from collections import deque
+
+import requests
+
+PRACTICUM_RECORD = os.getenv('PRACTICUM_RECORD')
+PRACTICUM_RECORD_MAX_BYTES = int(
+    os.getenv('PRACTICUM_RECORD_MAX_BYTES', 50 * 1024 * 1024))
+PRACTICUM_RECORD_BACKUPS = int(os.getenv('PRACTICUM_RECORD_BACKUPS', 5))
+PRACTICUM_REPLAY = os.getenv('PRACTICUM_REPLAY')
+PRACTICUM_REPLAY_SPEED = float(os.getenv('PRACTICUM_REPLAY_SPEED', 1))
+
+
+def account_of(headers):
+    """
+    Обезличенный идентификатор учётной записи по заголовку Authorization.
+    Совпадает с Account.account_id; сам токен в запись не попадает.
+    """
+    authorization = (headers or {}).get('Authorization', '')
+    token = authorization.split(' ', 1)[-1]
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+class Recorder:
+    """
+    Запись обменов с API в JSONL-файл: одна строка на запрос.
+    Файл ротируется по размеру, как RotatingFileHandler.
+    """
+
+    def __init__(self, path, max_bytes=PRACTICUM_RECORD_MAX_BYTES,
+                 backup_count=PRACTICUM_RECORD_BACKUPS):
+        """Открывает path на дозапись."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        self._file = open(path, 'ab')
+
+    def record(self, url, headers, params, response, elapsed):
+        """Дописывает запрос и ответ response строкой JSON."""
+        line = json.dumps({
+            'ts': time.time(),
+            'url': url,
+            'account': account_of(headers),
+            'params': params,
+            'status': response.status_code,
+            'headers': {
+                name: response.headers[name]
+                for name in ('ETag', 'Content-Type', 'Retry-After')
+                if name in response.headers
+            },
+            'elapsed': round(elapsed, 6),
+            'body': response.content.decode('utf-8', 'replace'),
+        }, ensure_ascii=False).encode('utf-8') + b'\n'
+        with self._lock:
+            if self._file.tell() + len(line) > self.max_bytes:
+                self._rotate()
+            self._file.write(line)
+            self._file.flush()
+
+    def _rotate(self):
+        self._file.close()
+        for number in range(self.backup_count - 1, 0, -1):
+            source = f'{self.path}.{number}'
+            if os.path.exists(source):
+                os.replace(source, f'{self.path}.{number + 1}')
+        if self.backup_count:
+            os.replace(self.path, f'{self.path}.1')
+        self._file = open(self.path, 'wb')
+
+    def close(self):
+        """Закрывает файл записи."""
+        with self._lock:
+            self._file.close()
+
+
+class ReplayResponse:
+    """Ответ из записи с интерфейсом requests.Response, нужным боту."""
+
+    def __init__(self, data):
+        """Восстанавливает ответ из строки записи."""
+        self.status_code = data['status']
+        self.headers = requests.structures.CaseInsensitiveDict(
+            data.get('headers', {}))
+        self.content = data['body'].encode('utf-8')
+        self.url = data['url']
+
+    def json(self):
+        """Тело ответа, разобранное из JSON."""
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        """Тело ответа кусками по chunk_size байт."""
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        """Соединения нет, закрывать нечего."""
+        pass
+
+    def __repr__(self):
+        """Как у requests.Response."""
+        return f'<ReplayResponse [{self.status_code}]>'
+
+
+class ReplaySession:
+    """
+    Подмена сессии requests, отдающая записанные ответы без сети.
+    Ответы выдаются по каждой учётной записи в порядке записи.
+    speed - во сколько раз быстрее реального времени воспроизводится
+    задержка ответа; 0 - без задержек.
+    """
+
+    def __init__(self, path, speed=PRACTICUM_REPLAY_SPEED, sleep=time.sleep):
+        """Индексирует файл записи; тела ответов читаются по требованию."""
+        self.path = path
+        self.speed = speed
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._offsets = defaultdict(deque)
+        with open(path, 'rb') as file:
+            offset = file.tell()
+            for line in iter(file.readline, b''):
+                if line.strip():
+                    account = json.loads(line)['account']
+                    self._offsets[account].append(offset)
+                offset = file.tell()
+        self._file = open(path, 'rb')
+
+    def remaining(self):
+        """Сколько записанных ответов ещё не выдано."""
+        with self._lock:
+            return sum(len(offsets) for offsets in self._offsets.values())
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        """Следующий записанный ответ для учётной записи из headers."""
+        account = account_of(headers)
+        with self._lock:
+            offsets = self._offsets.get(account)
+            if not offsets:
+                raise requests.ConnectionError(
+                    f'В записи {self.path} больше нет ответов '
+                    f'для учётной записи {account}')
+            self._file.seek(offsets.popleft())
+            data = json.loads(self._file.readline())
+        if self.speed:
+            self.sleep(data.get('elapsed', 0) / self.speed)
+        return ReplayResponse(data)
+
+    def close(self):
+        """Закрывает файл записи."""
+        self._file.close()
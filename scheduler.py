@@ -0,0 +1,69 @@
+import heapq
+import itertools
+import math
+import os
+import threading
+
+from metrics import LOOP_LAG
+from metrics import POLL_LAG
+
+POLL_TICK = float(os.getenv('POLL_TICK', 1))
+
+
+class PollScheduler:
+    """
+    Очередь учётных записей по времени следующего опроса (account.next_poll).
+    Хранится в куче, поэтому выбор созревших записей и перепланирование
+    стоят O(log n) на запись и не требуют обходить все учётные записи.
+    Сроки округляются вверх до tick секунд: записи, созревшие в пределах
+    одного тика, опрашиваются одним проходом цикла.
+    """
+
+    def __init__(self, accounts=(), tick=POLL_TICK):
+        """Ставит в очередь accounts по их next_poll."""
+        self.tick = tick
+        self._counter = itertools.count()
+        self._heap = [
+            (account.next_poll, next(self._counter), account)
+            for account in accounts
+        ]
+        heapq.heapify(self._heap)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Число учётных записей в очереди."""
+        return len(self._heap)
+
+    def add(self, account):
+        """Ставит учётную запись в очередь на account.next_poll."""
+        with self._lock:
+            heapq.heappush(
+                self._heap,
+                (account.next_poll, next(self._counter), account))
+
+    def pop_due(self, now):
+        """
+        Забирает из очереди записи, срок которых наступил к now.
+        Каждой записи проставляется account.lag - отставание от срока.
+        После опроса записи возвращаются в очередь через add.
+        """
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[2])
+        for account in due:
+            account.lag = now - account.next_poll
+            POLL_LAG.observe(account.lag)
+        if due:
+            LOOP_LAG.set(max(account.lag for account in due))
+        return due
+
+    def next_deadline(self, default):
+        """Ближайший срок опроса, округлённый вверх до тика, или default."""
+        with self._lock:
+            if not self._heap:
+                return default
+            deadline = self._heap[0][0]
+        if self.tick:
+            deadline = math.ceil(deadline / self.tick) * self.tick
+        return deadline
@@ -0,0 +1,190 @@
+import logging
+import os
+import queue
+import threading
+from collections import namedtuple
+
+from metrics import SINK_DELIVERIES
+
+NOTIFY_MENTOR_CHAT_ID = os.getenv('NOTIFY_MENTOR_CHAT_ID')
+NOTIFY_WEBHOOK_URL = os.getenv('NOTIFY_WEBHOOK_URL')
+NOTIFY_WEBHOOK_TIMEOUT = float(os.getenv('NOTIFY_WEBHOOK_TIMEOUT', 5))
+NOTIFY_QUEUE_SIZE = int(os.getenv('NOTIFY_QUEUE_SIZE', 1000))
+
+logger = logging.getLogger(__name__)
+
+Notification = namedtuple(
+    'Notification', 'account_id chat_id text transition')
+Notification.__doc__ = """
+Уведомление о смене статуса работы: учётная запись (хэш токена),
+чат ученика, текст сообщения и transitions.Transition.
+"""
+
+
+class ChatSink:
+    """Чат ученика: сообщение кладётся в бот (Outbox) без ожидания."""
+
+    name = 'chat'
+    blocking = False
+
+    def deliver(self, bot, notification):
+        """Отправляет текст в чат учётной записи."""
+        bot.send_message(notification.chat_id, notification.text)
+
+
+class GroupSink:
+    """Общий чат (например, наставников), куда дублируются уведомления."""
+
+    name = 'group'
+    blocking = False
+
+    def __init__(self, chat_id):
+        """chat_id - идентификатор общего чата Telegram."""
+        self.chat_id = chat_id
+
+    def deliver(self, bot, notification):
+        """Отправляет текст в общий чат с пометкой чата ученика."""
+        bot.send_message(
+            self.chat_id, f'Чат {notification.chat_id}: {notification.text}')
+
+
+class WebhookSink:
+    """
+    HTTP-приёмник: уведомление отправляется POST-запросом с телом JSON.
+    Запрос ограничен timeout секунд; токен учётной записи не передаётся.
+    """
+
+    name = 'webhook'
+    blocking = True
+
+    def __init__(self, url, timeout=NOTIFY_WEBHOOK_TIMEOUT):
+        """Приёмник по адресу url."""
+        self.url = url
+        self.timeout = timeout
+        self._session = None
+
+    def deliver(self, bot, notification):
+        """Отправляет уведомление; на ответ не 2xx - исключение."""
+        if self._session is None:
+            from http_client import create_session
+
+            self._session = create_session(pool_size=1)
+        response = self._session.post(
+            self.url, json=webhook_payload(notification),
+            timeout=self.timeout)
+        response.raise_for_status()
+
+
+def webhook_payload(notification):
+    """Тело запроса WebhookSink."""
+    transition = notification.transition
+    payload = {
+        'account': notification.account_id,
+        'chat_id': notification.chat_id,
+        'text': notification.text,
+    }
+    if transition is not None:
+        payload.update({
+            'homework_id': transition.homework_id,
+            'homework_name': transition.homework_name,
+            'old_status': (
+                transition.old.label if transition.old is not None
+                else None),
+            'status': transition.new.label,
+            'date_updated': transition.date_updated,
+        })
+    return payload
+
+
+class FanOut:
+    """
+    Рассылка каждого уведомления во все приёмники (sinks).
+    Неблокирующие приёмники (чаты через Outbox) получают уведомление
+    сразу. У каждого блокирующего приёмника (HTTP) свой поток и своя
+    очередь на queue_size уведомлений, поэтому медленный приёмник
+    не задерживает ни остальные, ни цикл опроса: при переполнении
+    его очереди уведомления для него отбрасываются.
+    """
+
+    def __init__(self, sinks, queue_size=NOTIFY_QUEUE_SIZE):
+        """Потоки приёмников запускаются при первом уведомлении."""
+        self.sinks = list(sinks)
+        self.queue_size = queue_size
+        self._queues = {}
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def publish(self, bot, notification):
+        """Передаёт notification всем приёмникам через bot (или Outbox)."""
+        for sink in self.sinks:
+            if not sink.blocking:
+                self._deliver(sink, bot, notification)
+                continue
+            try:
+                self._queue(sink).put_nowait((bot, notification))
+            except queue.Full:
+                SINK_DELIVERIES.inc(sink=sink.name, result='dropped')
+                logger.warning('Очередь приёмника %s переполнена', sink.name)
+
+    def join(self):
+        """Ждёт, пока блокирующие приёмники разберут свои очереди."""
+        with self._lock:
+            queues = list(self._queues.values())
+        for sink_queue in queues:
+            sink_queue.join()
+
+    def close(self, timeout=None):
+        """Дожидается доставки очередей и останавливает потоки приёмников."""
+        with self._lock:
+            queues, self._queues = list(self._queues.values()), {}
+            threads, self._threads = self._threads, []
+        for sink_queue in queues:
+            sink_queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def _queue(self, sink):
+        with self._lock:
+            sink_queue = self._queues.get(sink)
+            if sink_queue is None:
+                sink_queue = self._queues[sink] = queue.Queue(self.queue_size)
+                thread = threading.Thread(
+                    target=self._run, args=(sink, sink_queue),
+                    name=f'sink-{sink.name}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            return sink_queue
+
+    def _run(self, sink, sink_queue):
+        while True:
+            item = sink_queue.get()
+            try:
+                if item is None:
+                    return
+                self._deliver(sink, *item)
+            finally:
+                sink_queue.task_done()
+
+    @staticmethod
+    def _deliver(sink, bot, notification):
+        try:
+            sink.deliver(bot, notification)
+        except Exception as error:
+            SINK_DELIVERIES.inc(sink=sink.name, result='failed')
+            logger.error('Приёмник %s: %s', sink.name, error)
+        else:
+            SINK_DELIVERIES.inc(sink=sink.name, result='delivered')
+
+
+def default_sinks():
+    """
+    Приёмники уведомлений из окружения.
+    Чат ученика - всегда, общий чат - с NOTIFY_MENTOR_CHAT_ID,
+    HTTP-приёмник - с NOTIFY_WEBHOOK_URL.
+    """
+    sinks = [ChatSink()]
+    if NOTIFY_MENTOR_CHAT_ID:
+        sinks.append(GroupSink(NOTIFY_MENTOR_CHAT_ID))
+    if NOTIFY_WEBHOOK_URL:
+        sinks.append(WebhookSink(NOTIFY_WEBHOOK_URL))
+    return sinks
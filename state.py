@@ -0,0 +1,74 @@
+import json
+import os
+import sqlite3
+import threading
+
+STATE_DB = os.getenv('STATE_DB', 'state.sqlite3')
+
+
+def connect(path):
+    """
+    Соединение с SQLite-базой path в режиме WAL.
+    В WAL запись не блокирует чтение, а с synchronous=NORMAL
+    фиксация транзакции не ждёт fsync, оставаясь устойчивой к падению
+    процесса. Файл базы и журнал - path и path-wal.
+    """
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    return connection
+
+
+class StateStore:
+    """
+    Состояние опроса учётных записей в SQLite.
+    Курсор, ETag, статусы и сроки переживают перезапуск бота.
+    Сохраняются только опрошенные за цикл записи, одной транзакцией,
+    поэтому запись не зависит от общего числа учётных записей.
+    """
+
+    def __init__(self, path=':memory:'):
+        """Открывает (или создаёт) базу path."""
+        self._lock = threading.Lock()
+        self._connection = connect(path)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS accounts ('
+            'account_id TEXT PRIMARY KEY, state TEXT NOT NULL)'
+        )
+        self._connection.commit()
+
+    def load(self, accounts):
+        """
+        Восстанавливает состояние accounts из базы.
+        Возвращает число учётных записей, для которых оно нашлось.
+        """
+        by_id = {account.account_id: account for account in accounts}
+        restored = 0
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT account_id, state FROM accounts').fetchall()
+        for account_id, state in rows:
+            account = by_id.get(account_id)
+            if account is not None:
+                account.restore(json.loads(state))
+                restored += 1
+        return restored
+
+    def save(self, accounts):
+        """Сохраняет состояние accounts одной транзакцией."""
+        rows = [
+            (account.account_id,
+             json.dumps(account.snapshot(), separators=(',', ':')))
+            for account in accounts
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO accounts (account_id, state) '
+                'VALUES (?, ?)',
+                rows
+            )
+
+    def close(self):
+        """Закрывает базу."""
+        with self._lock:
+            self._connection.close()
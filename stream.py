@@ -0,0 +1,151 @@
+import codecs
+import json
+
+from exceptions import APIAnswerInvalidException
+
+WHITESPACE = ' \t\n\r'
+MAX_RECORD_SIZE = 1 << 20
+
+
+class HomeworkStream:
+    """
+    Потоковый разбор ответа ЯндексДомашки.
+    Принимает итератор кусков тела ответа (bytes) и по одной отдаёт
+    записи из массива homeworks, не загружая весь ответ в память.
+    После перебора в current_date лежит значение из ответа.
+    """
+
+    def __init__(self, chunks, encoding='utf-8',
+                 max_record_size=MAX_RECORD_SIZE):
+        """
+        Готовит разбор итератора chunks, например response.iter_content().
+        max_record_size - предел размера одной записи в символах.
+        """
+        self.max_record_size = max_record_size
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._exhausted = False
+        self.current_date = None
+        self.count = 0
+        self.has_homeworks = False
+
+    def __iter__(self):
+        """Записи массива homeworks по одной."""
+        if self._next_char() != '{':
+            raise TypeError('Ответ API не является объектом "dict"')
+        if self._peek() == '}':
+            self._pos += 1
+        else:
+            yield from self._members()
+        if not self.has_homeworks:
+            raise TypeError(
+                'Список домашних работ имеет тип "None" вместо "list"')
+
+    def _members(self):
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise APIAnswerInvalidException(
+                    'API_error: ключ ответа не строка')
+            self._expect(':')
+            if key == 'homeworks':
+                yield from self._homeworks()
+            else:
+                value = self._value()
+                if key == 'current_date':
+                    self.current_date = value
+            separator = self._next_char()
+            if separator == '}':
+                return
+            if separator != ',':
+                raise APIAnswerInvalidException(
+                    f'API_error: ожидалась "," или "}}", а не "{separator}"')
+
+    def _homeworks(self):
+        if self._peek() != '[':
+            value = self._value()
+            raise TypeError(
+                f'Список домашних работ имеет тип "{type(value)}" '
+                'вместо "list"')
+        self._pos += 1
+        self.has_homeworks = True
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            self.count += 1
+            separator = self._next_char()
+            if separator == ']':
+                return
+            if separator != ',':
+                raise APIAnswerInvalidException(
+                    f'API_error: ожидалась "," или "]", а не "{separator}"')
+
+    def _fill(self):
+        """Дочитывает следующий кусок; False, если поток кончился."""
+        if self._exhausted:
+            return False
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._exhausted = True
+            self._buffer += self._decoder.decode(b'', final=True)
+            return True
+        self._buffer += self._decoder.decode(chunk)
+        return True
+
+    def _skip_whitespace(self):
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return
+            if not self._fill():
+                raise APIAnswerInvalidException(
+                    'API_error: ответ оборвался')
+
+    def _peek(self):
+        self._skip_whitespace()
+        return self._buffer[self._pos]
+
+    def _next_char(self):
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _expect(self, expected):
+        char = self._next_char()
+        if char != expected:
+            raise APIAnswerInvalidException(
+                f'API_error: ожидался "{expected}", а не "{char}"')
+
+    def _value(self):
+        """
+        Разбирает одно JSON-значение с текущей позиции.
+        Значение принимается, только если за ним в буфере есть ещё символ
+        или поток кончился: иначе число могло быть обрезано куском.
+        """
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                too_long = (
+                    len(self._buffer) - self._pos > self.max_record_size)
+                if too_long or not self._fill():
+                    raise APIAnswerInvalidException(f'API_error: {error}')
+                continue
+            if end < len(self._buffer) or self._exhausted:
+                self._pos = end
+                return value
+            self._fill()
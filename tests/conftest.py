@@ -4,6 +4,31 @@ from os.path import abspath, dirname
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 
+import pytest  # noqa: E402
+import requests  # noqa: E402
+
+import homework  # noqa: E402
+import http_client  # noqa: E402
+from breaker import CircuitBreaker  # noqa: E402
+
 pytest_plugins = [
     'tests.fixtures.fixture_data'
 ]
+
+
+@pytest.fixture(autouse=True)
+def plain_requests_session(monkeypatch):
+    """Запросы идут через requests.get, чтобы его можно было подменить."""
+    monkeypatch.setattr(http_client, 'get_session', lambda: requests)
+
+
+@pytest.fixture(autouse=True)
+def fresh_breaker(monkeypatch):
+    """Каждый тест начинается с закрытым автоматом защиты API."""
+    monkeypatch.setattr(homework, 'PRACTICUM_BREAKER', CircuitBreaker())
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    """Запросы к API в тестах не ждут общего ограничителя частоты."""
+    monkeypatch.setattr(homework, 'PRACTICUM_LIMITER', None)
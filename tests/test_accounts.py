@@ -0,0 +1,225 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+import requests
+
+import accounts
+import homework
+import intervals
+import metrics
+from clock import VirtualClock
+from records import Status
+from dedup import DedupStore
+from exceptions import AccountsConfigException
+from utils import MockBot
+from utils import MockResponse
+
+
+class TestAccounts:
+
+    def test_load_accounts(self, tmp_path):
+        path = tmp_path / 'accounts.json'
+        path.write_text(json.dumps([
+            {'token': 'token1', 'chat_id': 1},
+            {'token': 'token2', 'chat_id': 2},
+        ]))
+        result = accounts.load_accounts(str(path))
+        assert [a.chat_id for a in result] == [1, 2], (
+            'Проверьте, что load_accounts читает все учётные записи'
+        )
+        assert result[0].headers == {'Authorization': 'OAuth token1'}, (
+            'Проверьте, что заголовок Authorization строится из токена'
+        )
+
+    @pytest.mark.parametrize('content', [
+        'not json',
+        json.dumps({'token': 'token1', 'chat_id': 1}),
+        json.dumps([{'token': 'token1'}]),
+        json.dumps([{'token': 123, 'chat_id': 1}]),
+        json.dumps([
+            {'token': 'token1', 'chat_id': 1},
+            {'token': 'token1', 'chat_id': 2},
+        ]),
+    ])
+    def test_load_accounts_invalid(self, tmp_path, content):
+        path = tmp_path / 'accounts.json'
+        path.write_text(content)
+        with pytest.raises(AccountsConfigException):
+            accounts.load_accounts(str(path))
+
+    def test_poll_accounts_per_account_state(self, monkeypatch):
+        def mock_get(url, headers=None, params=None, **kwargs):
+            token = headers['Authorization'].split()[1]
+            return MockResponse({
+                'homeworks': [{'homework_name': token, 'status': 'approved'}],
+                'current_date': 0,
+            })
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        bot = MockBot()
+        polled = [
+            accounts.Account('token1', 1),
+            accounts.Account('token2', 2),
+        ]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            homework.poll_accounts(bot, polled, executor)
+            homework.poll_accounts(bot, polled, executor)
+
+        assert sorted(chat_id for chat_id, _ in bot.sent) == [1, 2], (
+            'Проверьте, что каждая учётная запись получает сообщение '
+            'один раз и в свой чат'
+        )
+        for chat_id, text in bot.sent:
+            assert f'token{chat_id}' in text, (
+                'Проверьте, что сообщение уходит в чат своей учётной записи'
+            )
+
+    def test_poll_account_moves_cursor(self, monkeypatch):
+        requested = []
+
+        def mock_get(url, headers=None, params=None, **kwargs):
+            requested.append(params['from_date'])
+            return MockResponse({'homeworks': [], 'current_date': 1000000})
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        account = accounts.Account('token1', 1)
+        homework.poll_account(MockBot(), account)
+        homework.poll_account(MockBot(), account)
+        expected = 1000000 - homework.PRACTICUM_CURSOR_OVERLAP
+        assert requested == [0, expected], (
+            'Проверьте, что курсор опроса берётся из current_date ответа '
+            'с запасом PRACTICUM_CURSOR_OVERLAP'
+        )
+
+    def test_poll_account_keeps_cursor_on_error(self, monkeypatch):
+        def mock_get(url, headers=None, params=None, **kwargs):
+            return MockResponse({}, http_status=HTTPStatus.BAD_GATEWAY)
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        account = accounts.Account('token1', 1)
+        account.timestamp = 12345
+        homework.poll_account(MockBot(), account)
+        assert account.timestamp == 12345, (
+            'Проверьте, что при ошибке API курсор опроса не сдвигается'
+        )
+
+    def test_no_resend_after_restart(self, monkeypatch, tmp_path):
+        def mock_get(url, headers=None, params=None, **kwargs):
+            return MockResponse({
+                'homeworks': [{
+                    'id': 1, 'homework_name': 'hw', 'status': 'approved',
+                    'date_updated': '2022-01-01T00:00:00Z',
+                }],
+                'current_date': 0,
+            })
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        path = str(tmp_path / 'dedup.sqlite3')
+        bot = MockBot()
+        store = DedupStore(path)
+        homework.poll_account(bot, accounts.Account('token1', 1, store))
+        store.close()
+
+        store = DedupStore(path)
+        homework.poll_account(bot, accounts.Account('token1', 1, store))
+        assert len(bot.sent) == 1, (
+            'Проверьте, что после перезапуска уведомление не отправляется '
+            'повторно'
+        )
+
+    def test_unchanged_payload_not_parsed(self, monkeypatch):
+        decoded = []
+
+        def mock_get(url, headers=None, params=None, **kwargs):
+            response = MockResponse({
+                'homeworks': [{'homework_name': 'hw', 'status': 'approved'}],
+                'current_date': 1000000 + len(decoded) * 600,
+            })
+            json_method = response.json
+
+            def json():
+                decoded.append(True)
+                return json_method()
+
+            response.json = json
+            return response
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        before = metrics.POLLS.get(payload='unchanged')
+        account = accounts.Account('token1', 1)
+        account.timestamp = 1
+        for _ in range(3):
+            homework.poll_account(MockBot(), account)
+        assert len(decoded) == 1, (
+            'Проверьте, что неизменившийся ответ API не разбирается повторно'
+        )
+        assert metrics.POLLS.get(payload='unchanged') - before == 2
+
+    def test_not_modified_with_etag(self, monkeypatch):
+        sent_headers = []
+
+        def mock_get(url, headers=None, params=None, **kwargs):
+            sent_headers.append(headers)
+            if headers.get('If-None-Match') == '"v1"':
+                return MockResponse({}, http_status=HTTPStatus.NOT_MODIFIED)
+            return MockResponse(
+                {'homeworks': [], 'current_date': 1000000},
+                headers={'ETag': '"v1"'},
+            )
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        bot = MockBot()
+        account = accounts.Account('token1', 1)
+        homework.poll_account(bot, account)
+        homework.poll_account(bot, account)
+        assert sent_headers[1]['If-None-Match'] == '"v1"', (
+            'Проверьте, что ETag из ответа отправляется в If-None-Match'
+        )
+        assert not bot.sent, 'Ответ 304 не должен приводить к ошибке'
+
+    def test_poll_account_schedules_next_poll(self, monkeypatch):
+        def mock_get(url, headers=None, params=None, **kwargs):
+            return MockResponse({
+                'homeworks': [
+                    {'id': 7, 'homework_name': 'hw', 'status': 'reviewing'}
+                ],
+                'current_date': 0,
+            })
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        monkeypatch.setattr(homework, 'with_jitter', lambda interval: interval)
+        account = accounts.Account('token1', 1)
+        homework.poll_account(MockBot(), account, VirtualClock(1000))
+        assert account.statuses == {7: Status.REVIEWING}
+        assert account.next_poll == 1000 + intervals.POLL_INTERVAL_ACTIVE, (
+            'Проверьте, что следующий опрос назначается по статусам работ'
+        )
+
+    def test_first_poll_streamed(self, monkeypatch):
+        calls = []
+
+        def mock_get(url, headers=None, params=None, **kwargs):
+            calls.append(kwargs.get('stream'))
+            response = MockResponse({
+                'homeworks': [
+                    {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+                    {'id': 2, 'homework_name': 'hw2', 'status': 'rejected'},
+                ],
+                'current_date': 1000000,
+            })
+            response.json = None
+            return response
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        bot = MockBot()
+        account = accounts.Account('token1', 1)
+        homework.poll_account(bot, account)
+        assert calls == [True], (
+            'Проверьте, что первый опрос (вся история) читается потоково'
+        )
+        assert len(bot.sent) == 2
+        assert account.timestamp == (
+            1000000 - homework.PRACTICUM_CURSOR_OVERLAP
+        ), 'Проверьте, что после потокового разбора курсор сдвигается'
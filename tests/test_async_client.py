@@ -0,0 +1,152 @@
+import asyncio
+import os
+import pstats
+import socket
+
+import pytest
+
+import accounts
+import homework
+import metrics
+from async_client import AsyncPoller
+from async_client import AsyncSession
+from benchmarks.fakes import FakePracticum
+from exceptions import APIAnswerInvalidException
+from exceptions import APIUnavailableException
+from profiling import Profiler
+
+
+class CollectingBot:
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+
+
+@pytest.fixture
+def practicum(monkeypatch):
+    server = FakePracticum(homeworks=3, change_rate=0).start()
+    monkeypatch.setattr(homework, 'PRACTICUM_ENDPOINT', server.endpoint)
+    yield server
+    server.stop()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class TestAsyncClient:
+
+    def test_same_answer_as_sync(self, practicum):
+        headers = {'Authorization': 'OAuth token1'}
+
+        async def fetch():
+            session = AsyncSession()
+            try:
+                return [
+                    await homework.get_api_answer_async(session, 0, headers)
+                    for _ in range(3)
+                ], session.connections
+            finally:
+                await session.close()
+
+        answers, connections = asyncio.run(fetch())
+        expected = homework.request_api_answer(0, headers)
+        assert [answer['homeworks'] for answer in answers] == (
+            [expected['homeworks']] * 3
+        ), 'Проверьте, что асинхронный запрос возвращает тот же ответ'
+        assert connections == 1, (
+            'Проверьте, что соединение переиспользуется (keep-alive)'
+        )
+
+    def test_connection_error(self, monkeypatch):
+        monkeypatch.setattr(
+            homework, 'PRACTICUM_ENDPOINT',
+            f'http://127.0.0.1:{free_port()}/api/')
+
+        async def fetch():
+            return await homework.get_api_answer_async(AsyncSession(), 0)
+
+        with pytest.raises(APIUnavailableException):
+            asyncio.run(fetch())
+
+    def test_connect_timeout(self, monkeypatch):
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(asyncio, 'open_connection', hang)
+
+        async def fetch():
+            session = AsyncSession(connect_timeout=0.01)
+            return await homework.get_api_answer_async(session, 0)
+
+        with pytest.raises(APIUnavailableException):
+            asyncio.run(fetch())
+
+    def test_client_error_wrapped(self, practicum, monkeypatch):
+        monkeypatch.setattr(
+            homework, 'PRACTICUM_ENDPOINT', practicum.endpoint + 'missing/')
+
+        async def fetch():
+            return await homework.get_api_answer_async(AsyncSession(), 0)
+
+        with pytest.raises(APIAnswerInvalidException, match='API_error'):
+            asyncio.run(fetch())
+
+    def test_chunked(self):
+        async def read():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'4\r\n{"a"\r\n3;x=1\r\n: 1\r\n1\r\n}\r\n0\r\n\r\n')
+            reader.feed_eof()
+            return await AsyncSession._read_chunked(reader)
+
+        assert asyncio.run(read()) == b'{"a": 1}'
+
+    def test_many_accounts_one_loop(self, practicum):
+        bot = CollectingBot()
+        polled = [
+            accounts.Account(f'token-{number}', number)
+            for number in range(200)
+        ]
+        streamed = metrics.POLLS.get(payload='streamed')
+        with AsyncPoller(AsyncSession(pool_size=16)) as poller:
+            homework.poll_accounts(bot, polled, poller)
+            assert poller.session.connections == 0, (
+                'Проверьте, что первый опрос всей истории идёт '
+                'потоковым путём в пуле потоков'
+            )
+            assert metrics.POLLS.get(payload='streamed') == streamed + 200
+            assert len(bot.sent) == 200 * 3, (
+                'Проверьте, что асинхронный опрос отправляет уведомления'
+            )
+            assert all(account.timestamp for account in polled), (
+                'Проверьте, что курсор учётных записей сдвигается'
+            )
+            for account in polled:
+                account.timestamp = 1
+            homework.poll_accounts(bot, polled, poller)
+            connections = poller.session.connections
+        assert practicum.requests == 400
+        assert 1 <= connections <= 16, (
+            'Проверьте, что число соединений ограничено пулом'
+        )
+
+    def test_profiled_in_loop_thread(self, practicum, tmp_path, monkeypatch):
+        profiler = Profiler(cycles=1, directory=str(tmp_path))
+        monkeypatch.setattr(homework, 'PROFILER', profiler)
+        account = accounts.Account('token1', 1)
+        account.timestamp = 1
+        with AsyncPoller() as poller:
+            profiler.profile(
+                homework.poll_accounts, CollectingBot(), [account], poller)
+        name = next(
+            name for name in os.listdir(tmp_path) if name.endswith('.prof'))
+        stats = pstats.Stats(str(tmp_path / name))
+        functions = {function for _, _, function in stats.stats}
+        assert {'poll_account_async', 'read_homeworks'} <= functions, (
+            'Проверьте, что в профиль попадают опросы в цикле событий'
+        )
@@ -0,0 +1,87 @@
+import pytest
+import requests
+
+import accounts
+import breaker
+import homework
+from clock import VirtualClock
+from utils import MockBot
+from utils import MockResponse
+
+
+class TestBreaker:
+
+    def test_opens_after_threshold(self):
+        circuit = breaker.CircuitBreaker(threshold=2, delay=10, jitter=0)
+        assert not circuit.record_failure(0)
+        assert circuit.allow(1)
+        assert circuit.record_failure(1), (
+            'Проверьте, что автомат открывается после threshold неудач'
+        )
+        assert not circuit.allow(5)
+        assert circuit.retry_at == 11
+
+    def test_half_open_single_probe(self):
+        circuit = breaker.CircuitBreaker(threshold=1, delay=10, jitter=0)
+        circuit.record_failure(0)
+        assert circuit.allow(10)
+        assert not circuit.allow(10), (
+            'Проверьте, что в полуоткрытом состоянии пропускается '
+            'только один пробный запрос'
+        )
+        assert circuit.record_success()
+        assert circuit.allow(11)
+        assert not circuit.record_success()
+
+    @pytest.mark.parametrize('probes, retry_at', [
+        (1, 100 + 20), (2, 100 + 40), (5, 100 + 50),
+    ])
+    def test_exponential_backoff(self, probes, retry_at):
+        circuit = breaker.CircuitBreaker(
+            threshold=1, delay=10, max_delay=50, jitter=0)
+        circuit.record_failure(0)
+        for _ in range(probes):
+            assert circuit.allow(circuit.retry_at)
+            circuit.record_failure(100)
+        assert circuit.retry_at == retry_at, (
+            'Проверьте, что задержка удваивается до max_delay'
+        )
+
+    def test_api_outage_notified_once(self, monkeypatch):
+        state = {'down': True, 'requests': 0}
+
+        def mock_get(url, headers=None, params=None, **kwargs):
+            state['requests'] += 1
+            if state['down']:
+                raise requests.ConnectionError(f'attempt {state["requests"]}')
+            return MockResponse({'homeworks': [], 'current_date': 1000})
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        monkeypatch.setattr(
+            homework, 'PRACTICUM_BREAKER',
+            breaker.CircuitBreaker(threshold=2, delay=60, jitter=0))
+        clock = VirtualClock(1000)
+        bot = MockBot()
+        account = accounts.Account('token1', 1)
+        for _ in range(2):
+            homework.poll_account(bot, account, clock)
+        assert account.next_poll == 1060, (
+            'Проверьте, что следующий опрос назначается на пробу автомата'
+        )
+        for _ in range(5):
+            homework.poll_account(bot, account, clock)
+        assert state['requests'] == 2, (
+            'Проверьте, что при открытом автомате API не опрашивается'
+        )
+        assert bot.sent == [(1, homework.API_DOWN_MESSAGE)], (
+            'Проверьте, что о недоступности API сообщается один раз, '
+            'без сообщений о каждой ошибке'
+        )
+
+        clock.advance(60)
+        state['down'] = False
+        homework.poll_account(bot, account, clock)
+        homework.poll_account(bot, account, clock)
+        assert bot.sent[1:] == [(1, homework.API_UP_MESSAGE)], (
+            'Проверьте, что о восстановлении API сообщается один раз'
+        )
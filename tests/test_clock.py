@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import accounts
+import homework
+import http_client
+from benchmarks.fakes import HomeworkSource
+from benchmarks.fakes import PracticumSession
+from clock import VirtualClock
+from dedup import DedupStore
+from scheduler import PollScheduler
+
+
+class MockOutbox:
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+
+    def flush(self):
+        pass
+
+
+class TestClock:
+
+    def test_virtual_clock(self):
+        clock = VirtualClock(100)
+        clock.sleep(50)
+        clock.advance(-10)
+        assert clock.time() == 150, (
+            'Проверьте, что виртуальные часы идут только вперёд'
+        )
+
+    def test_run_loop_virtual_time(self, monkeypatch):
+        clock = VirtualClock(1_000_000)
+        source = HomeworkSource(homeworks=0, clock=clock.time)
+        session = PracticumSession(source)
+        monkeypatch.setattr(http_client, 'get_session', lambda: session)
+        monkeypatch.setattr(homework, 'with_jitter', lambda interval: interval)
+        dedup = DedupStore(clock=clock.time)
+        account = accounts.Account('token1', 1, dedup)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            homework.run_loop(
+                MockOutbox(), PollScheduler([account]), executor, dedup,
+                clock, cycles=10)
+        assert session.requests == 10, (
+            'Проверьте, что каждый проход цикла опрашивает учётную запись, '
+            'а не крутится вхолостую до наступления срока'
+        )
+        assert clock.time() - 1_000_000 == 1200 + 2400 + 3600 * 8, (
+            'Проверьте, что без работ интервал удваивается до предела'
+        )
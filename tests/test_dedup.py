@@ -0,0 +1,63 @@
+import dedup
+from records import HomeworkRecord
+from records import Status
+
+
+class FakeClock:
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestDedup:
+
+    def test_persisted_between_restarts(self, tmp_path):
+        path = str(tmp_path / 'dedup.sqlite3')
+        store = dedup.DedupStore(path)
+        key = dedup.homework_key(
+            HomeworkRecord(1, 'hw', Status.APPROVED, '2022-01-01'))
+        store.namespace('a').add(key)
+        store.close()
+
+        store = dedup.DedupStore(path)
+        assert key in store.namespace('a'), (
+            'Проверьте, что отправленные уведомления сохраняются на диске'
+        )
+        assert key not in store.namespace('b'), (
+            'Проверьте, что ключи разных учётных записей не смешиваются'
+        )
+
+    def test_status_change_is_new_key(self):
+        record = HomeworkRecord(1, 'hw', Status.REVIEWING, '1')
+        first = dedup.homework_key(record)
+        record = record._replace(status=Status.APPROVED, date_updated='2')
+        assert first != dedup.homework_key(record)
+
+    def test_ttl_eviction(self):
+        clock = FakeClock()
+        store = dedup.DedupStore(ttl=100, clock=clock)
+        store.add(['old'])
+        clock.now = 50
+        store.add(['new'])
+        clock.now = 120
+        assert store.prune() == 1
+        assert not store.contains(['old'])
+        assert store.contains(['new'])
+
+    def test_lru_eviction(self):
+        clock = FakeClock()
+        store = dedup.DedupStore(max_entries=2, clock=clock)
+        for number in range(3):
+            clock.now = number
+            store.add([number])
+        clock.now = 10
+        assert store.contains([0]), 'Ключ 0 ещё не вытеснен'
+        store.prune()
+        assert len(store) == 2
+        assert store.contains([0]), (
+            'Проверьте, что недавно использованный ключ не вытесняется'
+        )
+        assert not store.contains([1])
@@ -0,0 +1,86 @@
+import requests
+
+import accounts
+import homework
+from clock import VirtualClock
+from errors import ErrorAggregator
+from errors import ErrorEvent
+from errors import OTHER_GROUP
+from errors import error_event
+from exceptions import APIAnsverWrongData
+from utils import MockBot
+from utils import MockResponse
+
+
+class TestErrors:
+
+    def test_error_event_site(self):
+        def check_response():
+            raise APIAnsverWrongData('нет ключа homeworks')
+
+        try:
+            check_response()
+        except APIAnsverWrongData as error:
+            event = error_event(error)
+        assert event == ErrorEvent(
+            'APIAnsverWrongData', 'check_response', 'нет ключа homeworks'
+        ), 'Проверьте, что место ошибки берётся из traceback'
+
+    def test_digest_interval(self):
+        errors = ErrorAggregator(window=3600, interval=3600)
+        event = ErrorEvent('KeyError', 'check_response', 'первая')
+        errors.add(event, 1000)
+        assert 'KeyError в check_response: 1 раз' in errors.digest(1000), (
+            'Проверьте, что первая ошибка сообщается сразу'
+        )
+        for second in range(100):
+            errors.add(event._replace(text=f'текст {second}'), 1001 + second)
+            assert errors.digest(1001 + second) is None, (
+                'Проверьте, что сводка не отправляется чаще interval'
+            )
+        digest = errors.digest(4600)
+        assert 'KeyError в check_response: 101 раз' in digest, (
+            'Проверьте, что ошибки считаются в скользящем окне'
+        )
+        assert 'текст 99' in digest
+        assert errors.digest(9000) is None, (
+            'Проверьте, что без новых ошибок сводка не отправляется'
+        )
+        assert errors.counts(9000) == {}
+        assert len(errors) == 0, (
+            'Проверьте, что группы вне окна удаляются'
+        )
+
+    def test_groups_bounded(self):
+        errors = ErrorAggregator(max_groups=3)
+        for number in range(1000):
+            errors.add(ErrorEvent(f'Error{number}', 'site', 'x' * 1000), 0)
+        assert len(errors) == 4, (
+            'Проверьте, что число групп ограничено max_groups'
+        )
+        counts = errors.counts(0)
+        assert counts[OTHER_GROUP][0] == 997
+        assert len(counts[OTHER_GROUP][1]) < 1000, (
+            'Проверьте, что пример ошибки урезается'
+        )
+
+    def test_error_storm_one_message(self, monkeypatch):
+        def mock_get(url, headers=None, params=None, **kwargs):
+            return MockResponse({'current_date': 1000})
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        clock = VirtualClock(1000)
+        bot = MockBot()
+        account = accounts.Account('token1', 1)
+        for _ in range(50):
+            homework.poll_account(bot, account, clock)
+            clock.advance(60)
+        assert len(bot.sent) == 1, (
+            'Проверьте, что повторяющаяся ошибка не отправляется '
+            'при каждом опросе'
+        )
+        clock.advance(3600)
+        homework.poll_account(bot, account, clock)
+        assert len(bot.sent) == 2, (
+            'Проверьте, что повторяющаяся ошибка попадает в сводку'
+        )
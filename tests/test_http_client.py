@@ -0,0 +1,120 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import homework
+import http_client
+from exceptions import APIUnavailableException
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"homeworks": [], "current_date": 0}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ErrorHandler(KeepAliveHandler):
+
+    def do_GET(self):
+        body = b'{"error": "internal"}'
+        self.send_response(500)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def local_server():
+    yield from serve(KeepAliveHandler)
+
+
+@pytest.fixture
+def error_server():
+    yield from serve(ErrorHandler)
+
+
+class TestHttpClient:
+
+    def test_http_get_default_timeout(self, monkeypatch):
+        calls = []
+
+        def mock_get(url, **kwargs):
+            calls.append(kwargs)
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        http_client.http_get('https://example.com/')
+        assert calls[0]['timeout'] == (
+            http_client.HTTP_CONNECT_TIMEOUT, http_client.HTTP_READ_TIMEOUT
+        ), (
+            'Проверьте, что http_get по умолчанию передаёт таймауты '
+            'на соединение и чтение'
+        )
+
+    def test_connections_reused(self, monkeypatch, local_server):
+        session = http_client.create_session(pool_size=2)
+        monkeypatch.setattr(http_client, '_session', session)
+        for _ in range(5):
+            session.get(local_server, timeout=5).json()
+        stats = http_client.connection_stats()
+        assert stats == {'connections': 1, 'reused': 4}, (
+            'Проверьте, что последовательные запросы используют '
+            'одно keep-alive соединение'
+        )
+
+    def test_full_pool_does_not_block(self, local_server):
+        session = http_client.create_session(pool_size=1)
+        leaked = session.get(local_server, stream=True, timeout=5)
+        response = session.get(local_server, timeout=5)
+        assert response.status_code == 200, (
+            'Проверьте, что при занятом пуле запрос открывает новое '
+            'соединение, а не ждёт свободного'
+        )
+        leaked.close()
+
+    def test_rejected_stream_returns_connection(self, monkeypatch,
+                                                error_server):
+        session = http_client.create_session(pool_size=1)
+        monkeypatch.setattr(http_client, 'get_session', lambda: session)
+        monkeypatch.setattr(homework, 'PRACTICUM_ENDPOINT', error_server)
+        for _ in range(3):
+            with pytest.raises(APIUnavailableException):
+                homework.request_api_response(0, {}, stream=True)
+        pools = session.get_adapter(error_server).poolmanager.pools
+        [key] = pools.keys()
+        pool = pools.get(key)
+        assert pool.pool.qsize() == 1, (
+            'Проверьте, что отклонённый потоковый ответ закрывается '
+            'и соединение возвращается в пул'
+        )
+
+    def test_request_stats(self):
+        stats = http_client.RequestStats()
+        stats.observe(0.5)
+        stats.observe(1.5)
+        assert stats.as_dict() == {
+            'requests': 2,
+            'latency_avg': 1.0,
+            'latency_max': 1.5,
+            'latency_last': 1.5,
+        }
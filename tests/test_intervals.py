@@ -0,0 +1,49 @@
+import pytest
+
+import accounts
+import intervals
+from records import Status
+
+
+class TestIntervals:
+
+    def test_reviewing_polled_often(self):
+        statuses = {1: Status.APPROVED, 2: Status.REVIEWING}
+        assert intervals.next_interval(statuses, 3600) == (
+            intervals.POLL_INTERVAL_ACTIVE
+        ), 'Проверьте, что работы на проверке опрашиваются чаще'
+
+    def test_idle_backs_off(self):
+        interval = intervals.POLL_INTERVAL_DEFAULT
+        seen = []
+        for _ in range(10):
+            interval = intervals.next_interval({1: Status.APPROVED}, interval)
+            seen.append(interval)
+        assert seen[0] == 2 * intervals.POLL_INTERVAL_DEFAULT
+        assert seen[-1] == intervals.POLL_INTERVAL_IDLE_MAX, (
+            'Проверьте, что интервал для принятых работ растёт до предела'
+        )
+        assert intervals.next_interval({}, intervals.POLL_INTERVAL_ACTIVE) == (
+            2 * intervals.POLL_INTERVAL_DEFAULT
+        )
+
+    def test_rejected_default(self):
+        assert intervals.next_interval({1: Status.REJECTED}, 3600) == (
+            intervals.POLL_INTERVAL_DEFAULT
+        )
+
+    def test_jitter_bounds(self):
+        assert intervals.with_jitter(100, 0.1, rng=lambda: 0) == pytest.approx(90)
+        assert intervals.with_jitter(100, 0.1, rng=lambda: 1) == pytest.approx(110)
+
+    def test_sleep_time_not_negative(self):
+        assert intervals.sleep_time(100, 250) == 0
+        assert intervals.sleep_time(250, 100) == 150
+
+    def test_spread_start(self):
+        polled = [accounts.Account(f'token{number}', number)
+                  for number in range(4)]
+        intervals.spread_start(polled, 1000, window=600)
+        assert [account.next_poll for account in polled] == [
+            1000, 1150, 1300, 1450
+        ], 'Проверьте, что первые опросы разнесены по окну'
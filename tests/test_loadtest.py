@@ -0,0 +1,32 @@
+import homework
+from benchmarks import loadtest
+
+
+class TestLoadtest:
+
+    def test_smoke(self):
+        endpoint = homework.PRACTICUM_ENDPOINT
+        result = loadtest.run(loadtest.parse_args([
+            '--accounts', '3', '--homeworks', '2', '--cycles', '2',
+            '--workers', '2', '--senders', '1',
+        ]))
+        assert homework.PRACTICUM_ENDPOINT == endpoint, (
+            'Проверьте, что прогон возвращает PRACTICUM_ENDPOINT на место'
+        )
+        assert result['api_requests'] == 6
+        assert result['telegram_messages'] >= 3, (
+            'Проверьте, что первый цикл отправляет уведомления '
+            'каждой учётной записи'
+        )
+        for key in ('polls_per_second', 'cycle_p50', 'cycle_p99'):
+            assert result[key] > 0
+
+    def test_smoke_asyncio(self):
+        result = loadtest.run(loadtest.parse_args([
+            '--accounts', '3', '--homeworks', '2', '--cycles', '2',
+            '--workers', '2', '--senders', '1', '--asyncio',
+        ]))
+        assert result['asyncio'] is True
+        assert result['api_requests'] == 6, (
+            'Проверьте, что прогон в цикле событий опрашивает все записи'
+        )
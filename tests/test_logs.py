@@ -0,0 +1,40 @@
+import logging
+import queue
+
+import logs
+
+
+class TestLogs:
+
+    def test_short_truncates(self):
+        homeworks = [{'id': number, 'text': 'x' * 1000} for number in range(50)]
+        text = str(logs.Short(homeworks))
+        assert len(text) < 2000, (
+            'Проверьте, что большие объекты урезаются перед записью в лог'
+        )
+
+    def test_lazy_not_called_when_disabled(self):
+        calls = []
+        logger = logging.getLogger('test_logs.lazy')
+        logger.setLevel(logging.INFO)
+        logger.debug('%s', logs.Lazy(calls.append, 1))
+        assert not calls, (
+            'Проверьте, что значение не вычисляется для отключённого уровня'
+        )
+
+    def test_full_queue_drops(self):
+        handler = logs.DroppingQueueHandler(queue.Queue(1))
+        record = logging.makeLogRecord({'msg': 'запись'})
+        handler.handle(record)
+        handler.handle(record)
+        assert handler.dropped == 1
+
+    def test_written_by_listener(self, tmp_path):
+        path = tmp_path / 'test.log'
+        logger = logging.getLogger('test_logs.listener')
+        logger.setLevel(logging.INFO)
+        listener = logs.setup_logging(logger, path=str(path))
+        logger.info('В ответе %s домашних работ', 3)
+        listener.stop()
+        assert 'В ответе 3 домашних работ' in path.read_text(
+            encoding='utf-8')
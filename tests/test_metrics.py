@@ -0,0 +1,50 @@
+import urllib.request
+
+import pytest
+
+import metrics
+from exceptions import APIAnsverWrongData
+
+
+class TestMetrics:
+
+    def test_histogram_render(self):
+        histogram = metrics.Histogram(
+            'test_seconds', 'Тест.', ('stage',), buckets=(0.1, 1))
+        histogram.observe(0.05, stage='a')
+        histogram.observe(0.5, stage='a')
+        histogram.observe(5, stage='a')
+        lines = histogram.render()
+        assert 'test_seconds_bucket{stage="a",le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{stage="a",le="1"} 2' in lines
+        assert 'test_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+        assert 'test_seconds_count{stage="a"} 3' in lines
+        assert '# TYPE test_seconds histogram' in lines
+
+    def test_timed_counts_exceptions(self):
+        @metrics.timed('test_stage')
+        def fail():
+            raise APIAnsverWrongData('ошибка')
+
+        before = metrics.STAGE_EXCEPTIONS.get(
+            stage='test_stage', exception='APIAnsverWrongData')
+        with pytest.raises(APIAnsverWrongData):
+            fail()
+        assert metrics.STAGE_EXCEPTIONS.get(
+            stage='test_stage', exception='APIAnsverWrongData'
+        ) == before + 1
+        assert metrics.STAGE_SECONDS.count(stage='test_stage') >= 1
+
+    def test_server(self):
+        metrics.MESSAGES.inc(result='sent')
+        server = metrics.start_metrics_server(0)
+        try:
+            url = f'http://127.0.0.1:{server.server_port}/metrics'
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode('utf-8')
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'homework_messages_total{result="sent"}' in body, (
+            'Проверьте, что сервер отдаёт метрики в формате Prometheus'
+        )
@@ -0,0 +1,117 @@
+import logging
+import subprocess
+import sys
+import time
+from os.path import abspath, dirname
+
+import requests
+import telegram
+
+import accounts
+import homework
+from state import StateStore
+from utils import MockResponse
+
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+
+class MockBot:
+    sent = []
+
+    def __init__(self, token=None, **kwargs):
+        pass
+
+    def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+
+
+class TestOnce:
+
+    def test_import_is_light(self, tmp_path):
+        code = (
+            'import sys; import homework; '
+            'print(sorted(name for name in ("telegram", "requests") '
+            'if name in sys.modules))'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=tmp_path, capture_output=True,
+            text=True, env={'PYTHONPATH': ROOT}, check=True,
+        )
+        assert result.stdout.strip() == '[]', (
+            'Проверьте, что telegram и requests не импортируются '
+            'при загрузке homework'
+        )
+        assert list(tmp_path.iterdir()) == [], (
+            'Проверьте, что импорт homework не создаёт файлов'
+        )
+
+    def test_once_resumes(self, monkeypatch, tmp_path):
+        requested = []
+
+        def mock_get(url, headers=None, params=None, **kwargs):
+            requested.append(params['from_date'])
+            return MockResponse({
+                'homeworks': [{
+                    'id': 1, 'homework_name': 'hw', 'status': 'approved',
+                    'date_updated': '2022-01-01T00:00:00Z',
+                }],
+                'current_date': 1000000,
+            })
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        monkeypatch.setattr(telegram, 'Bot', MockBot)
+        monkeypatch.setattr(MockBot, 'sent', [])
+        monkeypatch.setattr(homework, 'setup_logging', lambda *args: None)
+        monkeypatch.setattr(homework, 'ACCOUNTS_FILE', None)
+        monkeypatch.setattr(homework, 'PRACTICUM_TOKEN', 'token1')
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '123:abc')
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', 1)
+        monkeypatch.setattr(
+            homework, 'DEDUP_DB', str(tmp_path / 'dedup.sqlite3'))
+        monkeypatch.setattr(
+            homework, 'STATE_DB', str(tmp_path / 'state.sqlite3'))
+
+        homework.main(['--once'])
+        assert logging.getLogger('profiling').isEnabledFor(logging.INFO), (
+            'Проверьте, что main включает INFO для логгеров модулей'
+        )
+        assert len(MockBot.sent) == 1
+        assert 'hw' in MockBot.sent[0][1]
+
+        homework.main(['--once'])
+        assert requested == [0], (
+            'Проверьте, что --once сохраняет срок следующего опроса '
+            'и не опрашивает учётную запись раньше него'
+        )
+
+        account = accounts.Account('token1', 1)
+        store = StateStore(str(tmp_path / 'state.sqlite3'))
+        assert store.load([account]) == 1
+        assert account.timestamp == (
+            1000000 - homework.PRACTICUM_CURSOR_OVERLAP
+        ), 'Проверьте, что курсор опроса сохраняется между запусками'
+        account.next_poll = 0
+        store.save([account])
+        store.close()
+
+        homework.main(['--once'])
+        assert requested == [0, account.timestamp], (
+            'Проверьте, что второй опрос идёт с сохранённым курсором'
+        )
+        account = accounts.Account('token1', 1)
+        store = StateStore(str(tmp_path / 'state.sqlite3'))
+        store.load([account])
+        assert account.payload_digest is not None, (
+            'Проверьте, что хэш ответа второго (непотокового) опроса '
+            'сохраняется в состоянии'
+        )
+        account.next_poll = time.time() + homework.ONCE_PERIOD / 2
+        store.save([account])
+        store.close()
+
+        homework.main(['--once'])
+        assert len(requested) == 3, (
+            'Проверьте, что --once опрашивает учётную запись, срок '
+            'которой наступит раньше следующего запуска'
+        )
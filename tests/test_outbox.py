@@ -0,0 +1,101 @@
+import threading
+
+import outbox
+
+
+class RetryAfter(Exception):
+
+    def __init__(self, retry_after):
+        super().__init__(f'Flood control exceeded. Retry in {retry_after}')
+        self.retry_after = retry_after
+
+
+class MockBot:
+
+    def __init__(self, failures=0):
+        self.sent = []
+        self.failures = failures
+        self.lock = threading.Lock()
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        with self.lock:
+            if self.failures:
+                self.failures -= 1
+                raise RetryAfter(0.01)
+            self.sent.append((chat_id, text))
+
+
+class TestOutbox:
+
+    def test_messages_coalesced_per_chat(self):
+        bot = MockBot()
+        box = outbox.Outbox(bot, global_rate=1000, chat_rate=1000)
+        box.start()
+        box.send_message(1, 'первое')
+        box.send_message(2, 'другой чат')
+        box.send_message(1, 'второе')
+        assert not bot.sent, (
+            'Проверьте, что сообщения не отправляются до flush()'
+        )
+        box.close(timeout=5)
+        assert sorted(bot.sent) == [
+            (1, 'первое\n\nвторое'),
+            (2, 'другой чат'),
+        ], 'Проверьте, что сообщения одного чата склеиваются в одно'
+
+    def test_retry_after_honoured(self):
+        bot = MockBot(failures=2)
+        box = outbox.Outbox(bot, senders=1, global_rate=1000, chat_rate=1000)
+        box.start()
+        box.send_message(1, 'текст')
+        box.close(timeout=5)
+        assert bot.sent == [(1, 'текст')], (
+            'Проверьте, что после RetryAfter сообщение отправляется повторно'
+        )
+
+    def test_throttled_chat_does_not_block_others(self):
+        bot = MockBot()
+        box = outbox.Outbox(bot, senders=1, global_rate=1000, chat_rate=4)
+        box._chat_bucket(1).capacity = 1
+        box._chat_bucket(1).tokens = 1
+        box.send_message(1, 'первое')
+        box.flush()
+        box.send_message(1, 'второе')
+        box.send_message(2, 'другой чат')
+        box.flush()
+        box.start()
+        box.close(timeout=5)
+        assert bot.sent == [
+            (1, 'первое'), (2, 'другой чат'), (1, 'второе'),
+        ], (
+            'Проверьте, что сообщение чата, исчерпавшего лимит, '
+            'откладывается, а не задерживает другие чаты'
+        )
+
+    def test_retry_after_pauses_only_its_chat(self):
+        class ChatFloodBot(MockBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                if chat_id == 1 and self.failures:
+                    self.failures -= 1
+                    raise RetryAfter(0.3)
+                self.sent.append((chat_id, text))
+
+        bot = ChatFloodBot(failures=1)
+        box = outbox.Outbox(bot, senders=1, global_rate=1000, chat_rate=1000)
+        box.send_message(1, 'первый чат')
+        box.send_message(2, 'второй чат')
+        box.start()
+        box.close(timeout=5)
+        assert bot.sent == [(2, 'второй чат'), (1, 'первый чат')], (
+            'Проверьте, что RetryAfter приостанавливает только свой чат'
+        )
+
+    def test_group_rate(self):
+        box = outbox.Outbox(MockBot(), chat_rate=1, group_rate=0.25)
+        assert box._chat_bucket('-1001').rate == 0.25
+        assert box._chat_bucket(-5).rate == 0.25
+        assert box._chat_bucket(5).rate == 1
+
+    def test_coalesce_respects_length(self):
+        blocks = outbox.coalesce(['a' * 6, 'b' * 3, 'c' * 12], max_length=10)
+        assert blocks == ['a' * 6, 'b' * 3, 'c' * 10, 'c' * 2]
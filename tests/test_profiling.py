@@ -0,0 +1,130 @@
+import cProfile
+import os
+import pstats
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import homework
+import profiling
+from profiling import Profiler
+
+
+def worker_function(value):
+    return value * 2
+
+
+class TestProfiling:
+
+    def test_off_costs_nothing(self, tmp_path):
+        profiler = Profiler(cycles=0, directory=str(tmp_path / 'profiles'))
+        assert profiler.wrap(worker_function) is worker_function, (
+            'Проверьте, что без профилирования функция не оборачивается'
+        )
+        assert not profiler.remaining
+        assert not os.path.exists(tmp_path / 'profiles')
+
+    def test_profile_writes_stats(self, tmp_path):
+        profiler = Profiler(cycles=2, directory=str(tmp_path))
+
+        def cycle():
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                task = profiler.wrap(worker_function)
+                return sum(executor.map(task, range(10)))
+
+        assert profiler.profile(cycle) == 90
+        assert profiler.remaining == 1
+        assert profiler.wrap(worker_function) is worker_function
+        names = sorted(os.listdir(tmp_path))
+        assert [name.split('.', 1)[1] for name in names] == [
+            'memory.txt', 'prof'], (
+            'Проверьте, что пишутся файлы pstats и tracemalloc с меткой'
+        )
+        stats = pstats.Stats(str(tmp_path / names[1]))
+        functions = {name for _, _, name in stats.stats}
+        assert {'cycle', 'worker_function'} <= functions, (
+            'Проверьте, что в профиль попадают и потоки пула'
+        )
+
+    @pytest.mark.skipif(
+        not hasattr(signal, 'SIGUSR1'), reason='нет SIGUSR1')
+    def test_signal_requests_cycles(self):
+        profiler = Profiler(cycles=0)
+        previous = signal.getsignal(signal.SIGUSR1)
+        try:
+            profiler.install_signal(cycles=4)
+            os.kill(os.getpid(), signal.SIGUSR1)
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+        assert profiler.remaining == 4, (
+            'Проверьте, что SIGUSR1 включает профилирование'
+        )
+
+    def test_run_loop_profiled(self, monkeypatch, tmp_path):
+        profiler = Profiler(cycles=1, directory=str(tmp_path))
+        monkeypatch.setattr(homework, 'PROFILER', profiler)
+        calls = []
+        monkeypatch.setattr(
+            homework, 'run_cycle', lambda *args: calls.append(args) or 0)
+
+        class Clock:
+            def time(self):
+                return 0
+
+            def sleep(self, seconds):
+                pass
+
+        homework.run_loop(None, None, None, None, Clock(), cycles=3)
+        assert len(calls) == 3
+        assert profiler.remaining == 0
+        assert len(os.listdir(tmp_path)) == 2, (
+            'Проверьте, что профилируется только запрошенное число проходов'
+        )
+
+    def test_empty_profiles_skipped(self, tmp_path):
+        profiler = Profiler(directory=str(tmp_path))
+        used = cProfile.Profile()
+        used.runcall(worker_function, 1)
+        profiler.write('stamp', [cProfile.Profile(), used], [], 0, 0)
+        stats = pstats.Stats(str(tmp_path / 'stamp.prof'))
+        assert 'worker_function' in {name for _, _, name in stats.stats}, (
+            'Проверьте, что профили без данных пропускаются'
+        )
+
+    def test_failures_do_not_escape(self, monkeypatch, tmp_path):
+        class BusyProfile(cProfile.Profile):
+            enabled = 0
+
+            def enable(self, *args, **kwargs):
+                BusyProfile.enabled += 1
+                if BusyProfile.enabled > 1:
+                    raise ValueError(
+                        'Another profiling tool is already active')
+                super().enable(*args, **kwargs)
+
+        monkeypatch.setattr(cProfile, 'Profile', BusyProfile)
+        profiler = Profiler(cycles=2, directory=str(tmp_path))
+        assert profiler.profile(
+            lambda: profiler.wrap(worker_function)(4)) == 8, (
+            'Проверьте, что сбой профилировщика потока не прерывает проход'
+        )
+        assert profiler.profile(worker_function, 3) == 6, (
+            'Проверьте, что сбой включения профилирования не прерывает проход'
+        )
+        assert profiler.remaining == 0
+
+    def test_write_failure_does_not_escape(self, tmp_path):
+        blocker = tmp_path / 'file'
+        blocker.write_text('')
+        profiler = Profiler(cycles=1, directory=str(blocker))
+        assert profiler.profile(worker_function, 2) == 4
+
+    def test_single_profiler_where_threads_are_seen(self, monkeypatch):
+        monkeypatch.setattr(profiling, 'PER_THREAD_PROFILES', False)
+        profiler = Profiler()
+        profiler.active = True
+        assert profiler.wrap(worker_function) is worker_function, (
+            'Проверьте, что на Python 3.12+ потоки пула не профилируются '
+            'отдельно'
+        )
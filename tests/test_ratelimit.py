@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+import requests
+
+import accounts
+import homework
+import ratelimit
+from clock import VirtualClock
+from ratelimit import TokenBucket
+from utils import MockBot
+from utils import MockResponse
+
+
+class FakeClock:
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket:
+
+    def test_burst_then_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+        assert [bucket.reserve() for _ in range(4)] == [0, 0, 0, 0.5]
+        clock.now = 0.5
+        assert bucket.reserve() == 0
+
+    def test_acquire_sleeps(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=4, capacity=1, clock=clock)
+        for _ in range(5):
+            bucket.acquire(sleep=clock.sleep)
+        assert clock.now == 1.0
+
+    def test_pause(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, clock=clock)
+        bucket.pause(30)
+        assert bucket.reserve() == 30
+        clock.now = 30
+        assert bucket.reserve() > 0, 'После паузы ведро наполняется заново'
+        clock.now = 30.1
+        assert bucket.reserve() == 0
+
+
+class TestRetryAfter:
+
+    @pytest.mark.parametrize('value, expected', [
+        ('120', 120),
+        (None, ratelimit.RETRY_AFTER_DEFAULT),
+        ('soon', ratelimit.RETRY_AFTER_DEFAULT),
+        ('Wed, 21 Oct 2015 07:28:30 GMT', 30),
+    ])
+    def test_retry_after_seconds(self, value, expected):
+        now = 1445412480  # Wed, 21 Oct 2015 07:28:00 GMT
+        assert ratelimit.retry_after_seconds(value, now) == expected, (
+            'Проверьте разбор Retry-After в секундах и в виде HTTP-даты'
+        )
+
+    def test_rate_limited(self, monkeypatch):
+        def mock_get(url, headers=None, params=None, **kwargs):
+            return MockResponse(
+                {}, http_status=HTTPStatus.TOO_MANY_REQUESTS,
+                headers={'Retry-After': '5000'})
+
+        limiter = TokenBucket(rate=10)
+        monkeypatch.setattr(requests, 'get', mock_get)
+        monkeypatch.setattr(homework, 'PRACTICUM_LIMITER', limiter)
+        bot = MockBot()
+        account = accounts.Account('token1', 1)
+        homework.poll_account(bot, account, VirtualClock(1000))
+        assert not bot.sent, 'Ответ 429 не должен приводить к сообщению'
+        assert account.next_poll == 6000, (
+            'Проверьте, что следующий опрос не раньше Retry-After'
+        )
+        assert limiter.reserve() > 4000, (
+            'Проверьте, что 429 приостанавливает общий ограничитель'
+        )
+        assert not homework.PRACTICUM_BREAKER.is_open
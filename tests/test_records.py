@@ -0,0 +1,56 @@
+import homework
+from records import HomeworkRecord
+from records import Status
+
+
+class TestRecords:
+
+    def test_status_codes(self):
+        assert Status.parse('approved') is Status.APPROVED
+        assert Status.parse('unknown') is None
+        assert Status.REVIEWING.label == 'reviewing'
+        for label in homework.HOMEWORK_STATUSES:
+            assert Status.parse(label) is not None, (
+                'Проверьте, что у каждого статуса из HOMEWORK_STATUSES '
+                'есть код Status'
+            )
+
+    def test_validate_keeps_only_needed_fields(self):
+        record, error = homework.validate_homework({
+            'id': 123,
+            'status': 'approved',
+            'homework_name': 'hw',
+            'reviewer_comment': 'Всё нравится',
+            'date_updated': '2020-02-13T14:40:57Z',
+            'lesson_name': 'Итоговый проект',
+        })
+        assert error is None
+        assert record == HomeworkRecord(
+            123, 'hw', Status.APPROVED, '2020-02-13T14:40:57Z')
+        assert homework.render_message(record) == (
+            'Изменился статус проверки работы "hw". '
+            + homework.HOMEWORK_STATUSES['approved']
+        )
+
+    def test_parse_statuses_batch(self):
+        result = homework.parse_statuses([
+            {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+            {'id': 2, 'status': 'approved'},
+            {'id': 3, 'homework_name': 'hw3', 'status': 'unknown'},
+            'not a dict',
+            {'id': 5, 'homework_name': 'hw5'},
+        ])
+        assert result.messages == [
+            'Изменился статус проверки работы "hw1". '
+            + homework.HOMEWORK_STATUSES['approved']
+        ]
+        assert [
+            (error.index, error.homework_id, error.field)
+            for error in result.errors
+        ] == [
+            (1, 2, 'homework_name'),
+            (2, 3, 'status'),
+            (3, None, 'homework'),
+            (4, 5, 'status'),
+        ], 'Проверьте, что ошибки собираются по каждой записи'
+        assert result.errors[0].exception is KeyError
@@ -0,0 +1,142 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+import accounts
+import homework
+import http_client
+import replay
+from dedup import DedupStore
+from scheduler import PollScheduler
+
+
+class RecordedResponse:
+
+    def __init__(self, data, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers or {})
+        self.content = json.dumps(data).encode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+@pytest.fixture
+def recorder(monkeypatch, tmp_path):
+    recorder = replay.Recorder(str(tmp_path / 'traffic.jsonl'))
+    monkeypatch.setattr(http_client, '_recorder', recorder)
+    yield recorder
+    recorder.close()
+
+
+class CollectingOutbox:
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+
+    def flush(self):
+        return len(self.sent)
+
+
+class TestReplay:
+
+    def test_run_cycle_under_replay(self, monkeypatch, recorder):
+        monkeypatch.setattr(
+            requests, 'get', lambda url, **kwargs: RecordedResponse({
+                'homeworks': [
+                    {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+                ],
+                'current_date': 1000,
+            }))
+        http_client.http_get(
+            homework.PRACTICUM_ENDPOINT,
+            headers={'Authorization': 'OAuth token1'},
+            params={'from_date': 0},
+        )
+        session = replay.ReplaySession(recorder.path, speed=0)
+        monkeypatch.setattr(http_client, '_recorder', None)
+        monkeypatch.setattr(http_client, '_session', session)
+        monkeypatch.setattr(http_client, 'get_session', lambda: session)
+
+        outbox = CollectingOutbox()
+        dedup = DedupStore()
+        account = accounts.Account('token1', 1, dedup)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            homework.run_cycle(
+                outbox, PollScheduler([account]), executor, dedup)
+        assert len(outbox.sent) == 1, (
+            'Проверьте, что бот работает в режиме воспроизведения'
+        )
+        assert http_client.connection_stats() == {
+            'connections': 0, 'reused': 0}
+
+    def test_record_and_replay(self, monkeypatch, recorder):
+        answers = iter([
+            RecordedResponse({'homeworks': [], 'current_date': 1}),
+            RecordedResponse(
+                {'homeworks': [], 'current_date': 2}, headers={'ETag': 'x'}),
+        ])
+        monkeypatch.setattr(
+            requests, 'get', lambda url, **kwargs: next(answers))
+        for token in ('a', 'b'):
+            http_client.http_get(
+                homework.PRACTICUM_ENDPOINT,
+                headers={'Authorization': f'OAuth {token}'},
+                params={'from_date': 0},
+            )
+        with open(recorder.path, encoding='utf-8') as file:
+            assert 'OAuth' not in file.read(), (
+                'Проверьте, что токен не попадает в запись'
+            )
+
+        session = replay.ReplaySession(recorder.path, speed=0)
+        monkeypatch.setattr(http_client, 'get_session', lambda: session)
+        monkeypatch.setattr(http_client, '_recorder', None)
+        response = http_client.http_get(
+            homework.PRACTICUM_ENDPOINT, headers={'Authorization': 'OAuth b'})
+        assert response.json()['current_date'] == 2, (
+            'Проверьте, что ответы воспроизводятся по учётным записям'
+        )
+        assert response.headers['etag'] == 'x'
+        assert session.remaining() == 1
+        session.close()
+
+    def test_replay_exhausted(self, tmp_path):
+        path = tmp_path / 'empty.jsonl'
+        path.write_text('')
+        session = replay.ReplaySession(str(path))
+        with pytest.raises(requests.ConnectionError):
+            session.get('url', headers={'Authorization': 'OAuth a'})
+        session.close()
+
+    def test_replay_delay(self, tmp_path):
+        path = tmp_path / 'traffic.jsonl'
+        path.write_text(json.dumps({
+            'url': 'url', 'account': replay.account_of({}), 'status': 200,
+            'elapsed': 0.5, 'body': '{}',
+        }) + '\n')
+        sleeps = []
+        session = replay.ReplaySession(str(path), speed=2, sleep=sleeps.append)
+        session.get('url')
+        assert sleeps == [0.25], (
+            'Проверьте, что задержка ответа ускоряется в speed раз'
+        )
+        session.close()
+
+    def test_rotation(self, tmp_path):
+        path = str(tmp_path / 'traffic.jsonl')
+        recorder = replay.Recorder(path, max_bytes=300, backup_count=2)
+        for number in range(10):
+            recorder.record(
+                'url', {}, None, RecordedResponse({'n': number}), 0.1)
+        recorder.close()
+        assert (tmp_path / 'traffic.jsonl.1').exists()
+        assert (tmp_path / 'traffic.jsonl.2').exists()
+        assert not (tmp_path / 'traffic.jsonl.3').exists(), (
+            'Проверьте, что хранится не больше backup_count копий'
+        )
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+import metrics
+from scheduler import PollScheduler
+
+
+def make_accounts(deadlines):
+    return [SimpleNamespace(next_poll=deadline) for deadline in deadlines]
+
+
+class TestScheduler:
+
+    def test_pop_due_in_order_with_lag(self):
+        polled = make_accounts([30, 10, 20, 100])
+        schedule = PollScheduler(polled, tick=0)
+        due = schedule.pop_due(35)
+        assert [account.next_poll for account in due] == [10, 20, 30]
+        assert [account.lag for account in due] == [25, 15, 5], (
+            'Проверьте, что для каждой записи считается отставание от срока'
+        )
+        assert metrics.LOOP_LAG.get() == 25
+        assert len(schedule) == 1
+        assert schedule.pop_due(35) == [], (
+            'Проверьте, что забранные записи не выдаются повторно до add'
+        )
+
+    def test_reschedule(self):
+        polled = make_accounts([10, 20])
+        schedule = PollScheduler(polled, tick=0)
+        first, = schedule.pop_due(10)
+        first.next_poll = 50
+        schedule.add(first)
+        assert schedule.next_deadline(default=0) == 20
+        assert schedule.pop_due(60) == [polled[1], first]
+
+    def test_tick_rounding(self):
+        schedule = PollScheduler(make_accounts([10.2]), tick=1)
+        assert schedule.next_deadline(default=0) == 11, (
+            'Проверьте, что срок округляется вверх до тика'
+        )
+        assert PollScheduler(tick=1).next_deadline(default=600) == 600
+
+    def test_many_accounts(self):
+        polled = make_accounts(range(100000))
+        schedule = PollScheduler(polled, tick=0)
+        assert len(schedule.pop_due(9.5)) == 10
+        assert schedule.next_deadline(default=0) == 10
@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import accounts
+import homework
+import metrics
+from records import Status
+from sinks import ChatSink
+from sinks import FanOut
+from sinks import GroupSink
+from sinks import Notification
+from sinks import WebhookSink
+from transitions import Transition
+
+
+class CollectingBot:
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        self.server.received.append(json.loads(self.rfile.read(length)))
+        self.send_response(self.server.code)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def webhook():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), WebhookHandler)
+    server.received = []
+    server.code = 200
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class BlockedSink:
+    name = 'blocked'
+    blocking = True
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.delivered = []
+
+    def deliver(self, bot, notification):
+        self.release.wait(5)
+        self.delivered.append(notification)
+
+
+NOTIFICATION = Notification(
+    'abc', 1, 'Изменился статус',
+    Transition(7, 'hw7', Status.REVIEWING, Status.APPROVED, '2022-01-01'))
+
+
+class TestSinks:
+
+    def test_fan_out(self, webhook):
+        bot = CollectingBot()
+        fan_out = FanOut([
+            ChatSink(), GroupSink(-100),
+            WebhookSink(f'http://127.0.0.1:{webhook.server_port}/hook'),
+        ])
+        fan_out.publish(bot, NOTIFICATION)
+        fan_out.close(timeout=5)
+        assert bot.sent == [
+            (1, 'Изменился статус'), (-100, 'Чат 1: Изменился статус'),
+        ], 'Проверьте, что уведомление уходит в чат ученика и общий чат'
+        assert webhook.received == [{
+            'account': 'abc', 'chat_id': 1, 'text': 'Изменился статус',
+            'homework_id': 7, 'homework_name': 'hw7',
+            'old_status': 'reviewing', 'status': 'approved',
+            'date_updated': '2022-01-01',
+        }], 'Проверьте тело запроса HTTP-приёмника'
+
+    def test_failed_webhook_counted(self, webhook):
+        webhook.code = 500
+        failed = metrics.SINK_DELIVERIES.get(sink='webhook', result='failed')
+        fan_out = FanOut([
+            WebhookSink(f'http://127.0.0.1:{webhook.server_port}/hook')])
+        fan_out.publish(CollectingBot(), NOTIFICATION)
+        fan_out.close(timeout=5)
+        assert metrics.SINK_DELIVERIES.get(
+            sink='webhook', result='failed') == failed + 1
+
+    def test_slow_sink_does_not_block(self):
+        bot = CollectingBot()
+        blocked = BlockedSink()
+        fan_out = FanOut([blocked, ChatSink()], queue_size=2)
+        dropped = metrics.SINK_DELIVERIES.get(sink='blocked', result='dropped')
+        start = time.monotonic()
+        for _ in range(5):
+            fan_out.publish(bot, NOTIFICATION)
+        assert time.monotonic() - start < 1, (
+            'Проверьте, что медленный приёмник не задерживает рассылку'
+        )
+        assert len(bot.sent) == 5, (
+            'Проверьте, что остальные приёмники получают уведомления сразу'
+        )
+        assert metrics.SINK_DELIVERIES.get(
+            sink='blocked', result='dropped') >= dropped + 2, (
+            'Проверьте, что очередь медленного приёмника ограничена'
+        )
+        blocked.release.set()
+        fan_out.close(timeout=5)
+        assert 2 <= len(blocked.delivered) <= 3
+
+    def test_status_change_fanned_out(self, monkeypatch):
+        monkeypatch.setattr(
+            homework, 'NOTIFY_SINKS', FanOut([ChatSink(), GroupSink(-100)]))
+        bot = CollectingBot()
+        account = accounts.Account('token1', 1)
+        homework.handle_homework(bot, account, {
+            'id': 1, 'homework_name': 'hw1', 'status': 'approved',
+        }, set())
+        assert [chat_id for chat_id, _ in bot.sent] == [1, -100], (
+            'Проверьте, что смена статуса уходит во все приёмники один раз'
+        )
@@ -0,0 +1,18 @@
+from benchmarks import soak
+
+
+class TestSoak:
+
+    def test_smoke(self):
+        result = soak.run(soak.parse_args([
+            '--accounts', '2', '--homeworks', '2', '--days', '1',
+            '--workers', '1',
+        ]))
+        assert result['simulated_days'] >= 1
+        assert result['wall_seconds'] < 60, (
+            'Проверьте, что симуляция не ждёт настоящего времени'
+        )
+        assert result['days'][0]['messages'] > 0
+        assert result['api_requests'] >= result['cycles'], (
+            'Проверьте, что проходы цикла без опросов не крутятся вхолостую'
+        )
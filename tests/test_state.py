@@ -0,0 +1,77 @@
+import sqlite3
+
+import accounts
+import homework
+from dedup import DedupStore
+from records import Status
+from state import StateStore
+
+
+class TestState:
+
+    def test_resume(self, tmp_path):
+        path = str(tmp_path / 'state.sqlite3')
+        dedup = DedupStore()
+        account = accounts.Account('token1', 1, dedup)
+        account.timestamp = 1000
+        account.etag = 'W/"1"'
+        account.statuses = {1: Status.REVIEWING, 'hw2': Status.APPROVED}
+        account.interval = 120
+        account.next_poll = 1120.5
+        account.payload_digest = homework.payload_digest(
+            b'{"homeworks": [], "current_date": 1000}')
+        store = StateStore(path)
+        store.save([account])
+        store.close()
+
+        restored = accounts.Account('token1', 1, dedup)
+        other = accounts.Account('token2', 2, dedup)
+        store = StateStore(path)
+        assert store.load([restored, other]) == 1
+        assert restored.snapshot() == account.snapshot(), (
+            'Проверьте, что после перезапуска состояние опроса '
+            'восстанавливается полностью'
+        )
+        assert restored.statuses == account.statuses
+        assert other.timestamp == 0
+        store.close()
+
+    def test_wal_mode(self, tmp_path):
+        path = str(tmp_path / 'state.sqlite3')
+        StateStore(path).close()
+        connection = sqlite3.connect(path)
+        mode = connection.execute('PRAGMA journal_mode').fetchone()[0]
+        connection.close()
+        assert mode == 'wal', 'Проверьте, что база состояния работает в WAL'
+
+    def test_save_only_given(self, tmp_path):
+        dedup = DedupStore()
+        first = accounts.Account('token1', 1, dedup)
+        second = accounts.Account('token2', 2, dedup)
+        store = StateStore()
+        store.save([first, second])
+        second.timestamp = 500
+        first.timestamp = 700
+        store.save([first])
+        second.timestamp = 0
+        first.timestamp = 0
+        store.load([first, second])
+        assert (first.timestamp, second.timestamp) == (700, 0)
+
+    def test_failed_save_does_not_stop_cycle(self):
+        class BrokenStore:
+            def save(self, accounts):
+                raise TypeError('not JSON serializable')
+
+        class Outbox:
+            def flush(self):
+                return 0
+
+        account = accounts.Account('token1', 1)
+        account.next_poll = 10 ** 12
+        schedule = homework.PollScheduler([account])
+        deadline = homework.run_cycle(
+            Outbox(), schedule, None, DedupStore(), state=BrokenStore())
+        assert deadline == 10 ** 12, (
+            'Проверьте, что сбой сохранения состояния не прерывает проход'
+        )
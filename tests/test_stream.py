@@ -0,0 +1,66 @@
+import json
+import tracemalloc
+
+import pytest
+
+from exceptions import APIAnswerInvalidException
+from stream import HomeworkStream
+
+
+def chunked(data, size):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+class TestStream:
+
+    @pytest.mark.parametrize('size', [1, 3, 64, 4096])
+    def test_records_and_current_date(self, size):
+        data = {
+            'current_date': 1634567890,
+            'homeworks': [
+                {'id': 1, 'homework_name': 'работа', 'status': 'approved'},
+                {'id': 2, 'homework_name': 'hw2', 'status': 'rejected'},
+            ],
+        }
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        stream = HomeworkStream(chunked(body, size))
+        assert list(stream) == data['homeworks'], (
+            'Проверьте, что записи разбираются при любой нарезке ответа'
+        )
+        assert stream.current_date == 1634567890
+
+    @pytest.mark.parametrize('body, error', [
+        (b'[]', TypeError),
+        (b'{"current_date": 1}', TypeError),
+        (b'{"homeworks": {"id": 1}}', TypeError),
+        (b'{"homeworks": [{"id": 1}', APIAnswerInvalidException),
+        (b'{"homeworks": [{"id": }]}', APIAnswerInvalidException),
+    ])
+    def test_invalid(self, body, error):
+        with pytest.raises(error):
+            list(HomeworkStream(chunked(body, 5)))
+
+    def test_memory_bounded(self):
+        record = json.dumps({
+            'id': 1, 'status': 'approved', 'homework_name': 'hw',
+            'reviewer_comment': 'x' * 500,
+        }).encode()
+        count = 20000
+
+        def body():
+            yield b'{"homeworks": ['
+            for number in range(count):
+                yield (b',' if number else b'') + record
+            yield b'], "current_date": 1}'
+
+        tracemalloc.start()
+        try:
+            total = sum(1 for _ in HomeworkStream(body()))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert total == count
+        assert peak < len(record) * count / 10, (
+            'Проверьте, что потоковый разбор не держит весь ответ в памяти'
+        )
@@ -0,0 +1,57 @@
+import accounts
+import homework
+from records import HomeworkRecord
+from records import Status
+from transitions import StatusTracker
+from transitions import Transition
+
+
+class TestTransitions:
+
+    def test_events(self):
+        tracker = StatusTracker()
+        rejected = HomeworkRecord(1, 'hw', Status.REJECTED, '1')
+        assert tracker.observe(rejected) == Transition(
+            1, 'hw', None, Status.REJECTED, '1')
+        assert tracker.observe(rejected) is None, (
+            'Проверьте, что без изменений событие не порождается'
+        )
+        approved = rejected._replace(status=Status.APPROVED, date_updated='2')
+        assert tracker.observe(approved).old == Status.REJECTED
+        again = approved._replace(date_updated='3')
+        event = tracker.observe(again)
+        assert (event.old, event.new) == (Status.APPROVED, Status.APPROVED), (
+            'Проверьте, что повторная проверка с тем же итогом '
+            'отличается от смены статуса'
+        )
+
+    def test_same_name_different_ids(self):
+        tracker = StatusTracker()
+        first = HomeworkRecord(1, 'hw', Status.APPROVED, '1')
+        second = first._replace(id=2)
+        assert tracker.observe(first) is not None
+        assert tracker.observe(second) is not None, (
+            'Проверьте, что работы с одинаковым текстом не склеиваются'
+        )
+
+    def test_unchanged_homework_skips_dedup(self):
+        class Sent(set):
+            lookups = 0
+
+            def __contains__(self, key):
+                Sent.lookups += 1
+                return super().__contains__(key)
+
+        account = accounts.Account('token1', 1)
+        account.sent = Sent()
+        sent = []
+        bot = type('Bot', (), {
+            'send_message': lambda self, chat_id, text: sent.append(text)})()
+        item = {'id': 1, 'homework_name': 'hw', 'status': 'approved'}
+        for _ in range(3):
+            homework.handle_homework(bot, account, item, set())
+        assert len(sent) == 1
+        assert Sent.lookups == 1, (
+            'Проверьте, что хранилище отправленных проверяется только '
+            'для работ с переходом статуса'
+        )
@@ -1,3 +1,5 @@
+import json
+from http import HTTPStatus
 from inspect import signature
 from types import ModuleType
 
@@ -37,3 +39,32 @@ def check_default_var_exists(scope: ModuleType, var_name: str) -> None:
         f'{var_name} должна быть переменной, а не функцией.'
     )
 
+
+class MockResponse:
+    """Response of requests.get with a JSON body."""
+
+    def __init__(self, data, http_status=HTTPStatus.OK, headers=None):
+        self.data = data
+        self.status_code = http_status
+        self.headers = headers or {}
+        self.content = json.dumps(data).encode()
+
+    def json(self):
+        return self.data
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), 7):
+            yield self.content[start:start + 7]
+
+    def close(self):
+        pass
+
+
+class MockBot:
+    """Telegram bot that collects sent messages in sent."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append((chat_id, text))
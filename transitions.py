@@ -0,0 +1,45 @@
+from collections import namedtuple
+
+from metrics import TRANSITIONS
+
+Transition = namedtuple(
+    'Transition', 'homework_id homework_name old new date_updated')
+Transition.__doc__ = """
+Смена статуса работы: old -> new (old is None - работа встречена впервые).
+old == new означает повторную проверку с тем же итогом (новый date_updated).
+"""
+
+
+class StatusTracker:
+    """
+    Последний известный статус и date_updated каждой работы по её id.
+    observe сравнивает пришедшую запись только с записью той же работы,
+    поэтому стоимость не зависит от числа остальных работ.
+    """
+
+    __slots__ = ('statuses', 'updated')
+
+    def __init__(self, statuses=None, updated=None):
+        """Трекер с известными статусами statuses и датами updated."""
+        self.statuses = {} if statuses is None else statuses
+        self.updated = {} if updated is None else updated
+
+    def observe(self, record):
+        """
+        Учитывает HomeworkRecord и возвращает его Transition.
+        Если ни статус, ни date_updated не изменились, возвращает None.
+        """
+        old = self.statuses.get(record.id)
+        if (
+            old == record.status
+            and self.updated.get(record.id) == record.date_updated
+        ):
+            return None
+        self.statuses[record.id] = record.status
+        self.updated[record.id] = record.date_updated
+        TRANSITIONS.inc(
+            old=old.label if old is not None else 'new',
+            new=record.status.label)
+        return Transition(
+            record.id, record.homework_name, old, record.status,
+            record.date_updated)